@@ -1,10 +1,26 @@
 import os
-from time import sleep
+import hashlib
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+from functools import partial
+from queue import Queue, Empty
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
 from libs.scraper_extractor import Scraper
+from libs.scraper_login import SessionLostError, LoginError
+from libs.scraper_api import ApiScraper, SessionExpiredError
 from libs.data_manager import DataManager
+from libs.output_sinks import OutputSink, SheetsSink, SqliteSink, ArchiveSink
+from libs.output_writer import OutputWriter
+from libs.date_ranges import split_date_range, DATE_FORMAT
+from libs.checkpoint import CheckpointStore
+from libs.case_index import CaseIndex
+from libs.session_store import SessionStore
+from libs.account_pool import AccountPool
+from libs.metrics import metrics, MetricsReporter
 
 # Env variables
 load_dotenv()
@@ -16,50 +32,656 @@ SHOW_BROWSER = os.getenv("SHOW_BROWSER") == "True"
 START_DATE = os.getenv("START_DATE")
 END_DATE = os.getenv("END_DATE")
 DEBUG = os.getenv("DEBUG") == "True"
+WORKERS = int(os.getenv("WORKERS", "1"))
+SHARD_SIZE = os.getenv("SHARD_SIZE", "")
+CASE_TYPES = os.getenv("CASE_TYPES", "")
+MULTI_SELECT_CASE_TYPES = os.getenv("MULTI_SELECT_CASE_TYPES") == "True"
+ENGINE = os.getenv("ENGINE", "browser")
+NETWORK_EXTRACTION = os.getenv("NETWORK_EXTRACTION") == "True"
+SCREENSHOTS_RATE = float(os.getenv("SCREENSHOTS_RATE", "0"))
+RESUME = os.getenv("RESUME") == "True"
+PAGES_PER_TASK = int(os.getenv("PAGES_PER_TASK", "0"))
+INCREMENTAL = os.getenv("INCREMENTAL") == "True"
+CASE_INDEX = os.getenv("CASE_INDEX") == "True" or INCREMENTAL
+OUTPUT_SINKS = os.getenv("OUTPUT_SINKS", "sheets")
+SYNC_SHEET = os.getenv("SYNC_SHEET") == "True"
+ARCHIVE_FLUSH_ROWS = int(os.getenv("ARCHIVE_FLUSH_ROWS", "500"))
+METRICS_INTERVAL = int(os.getenv("METRICS_INTERVAL", "60"))
+PROFILE_COMMANDS = os.getenv("PROFILE_COMMANDS") == "True"
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", str(not SHOW_BROWSER)) == "True"
+PAGE_LOAD_STRATEGY = os.getenv("PAGE_LOAD_STRATEGY", "eager")
+NAVIGATION_BUDGET = float(os.getenv("NAVIGATION_BUDGET", "30"))
+CHROME_PROFILES = os.getenv("CHROME_PROFILES") == "True"
+MAX_SESSION_LOSSES = int(os.getenv("MAX_SESSION_LOSSES", "3"))
+SESSION_COOKIES = [
+    name.strip() for name in os.getenv("SESSION_COOKIES", "").split(",")
+    if name.strip()
+]
+HOME_PAGE = os.getenv(
+    "HOME_PAGE", "https://research.txcourts.gov/CourtRecordsSearch/#!"
+)
 
 # Paths
 current_path = os.path.dirname(os.path.abspath(__file__))
 creds_path = os.path.join(current_path, "credentials.json")
+checkpoints_path = os.path.join(current_path, "checkpoints.json")
+case_index_path = os.path.join(current_path, "cases_index.sqlite3")
+output_db_path = os.path.join(current_path, "output.sqlite3")
+archive_path = os.path.join(current_path, "output_archive.jsonl.gz")
+metrics_folder = os.path.join(current_path, "metrics")
+diagnostics_folder = os.path.join(current_path, "diagnostics")
+profiles_folder = os.path.join(current_path, "profiles")
+chrome_profiles_folder = os.path.join(current_path, "chrome_profiles")
+sessions_path = os.path.join(current_path, "sessions.json")
 
 
-def main():
-    # Main workflow: scrape each ready case from the input sheet,
-    # update the output sheet with the scraped data, and update the status
+def get_case_types() -> list[str]:
+    """ Return the case types to search, from 'CASE_TYPES' env variable
+    ("all" or names separated by commas), or asking the user for one
 
-    # Header
-    print("\n----------------------------------")
-    print("TXCourts (Advance) Research Bot")
-    print("----------------------------------\n")
+    Returns:
+        list[str]: case types names
+
+    Raises:
+        ValueError: if a case type is not in 'Scraper.case_types'
+    """
+
+    if not CASE_TYPES:
+        return [Scraper.request_case_type(DEBUG)]
+
+    if CASE_TYPES.strip().lower() == "all":
+        return list(Scraper.case_types)
+
+    case_types = [
+        case_type.strip().upper() for case_type in CASE_TYPES.split(",")
+        if case_type.strip()
+    ]
+
+    invalid_case_types = [
+        case_type for case_type in case_types if case_type not in Scraper.case_types
+    ]
+    if invalid_case_types:
+        raise ValueError(
+            f"Invalid case types: {', '.join(invalid_case_types)}. "
+            f"Valid case types: {', '.join(Scraper.case_types)}"
+        )
+
+    return case_types
+
+
+def get_accounts() -> list[tuple[str, str]]:
+    """ Return the accounts of the workers, from 'USER_EMAIL' and 'USER_PASSWORD'
+    env variables, and the numbered ones ('USER_EMAIL_2', 'USER_PASSWORD_2'...)
+
+    Returns:
+        list[tuple[str, str]]: email and password of each account
+    """
+
+    accounts = [(USER_EMAIL, USER_PASSWORD)]
+    number = 2
+    while os.getenv(f"USER_EMAIL_{number}"):
+        accounts.append((
+            os.getenv(f"USER_EMAIL_{number}"),
+            os.getenv(f"USER_PASSWORD_{number}", "")
+        ))
+        number += 1
+
+    return accounts
+
+
+def get_output_sinks() -> list[OutputSink]:
+    """ Return the output sinks, from 'OUTPUT_SINKS' env variable
+    ("sheets", "sqlite", "archive" or several separated by commas)
+
+    Returns:
+        list[OutputSink]: output sinks
+    """
+
+    sinks = []
+    for sink_name in OUTPUT_SINKS.split(","):
+        sink_name = sink_name.strip().lower()
+        if sink_name == "sheets":
+            sinks.append(SheetsSink(GOOGLE_SHEET_LINK, creds_path, SHEET_OUTPUT))
+        elif sink_name == "sqlite":
+            sinks.append(SqliteSink(output_db_path))
+        elif sink_name == "archive":
+            sinks.append(ArchiveSink(archive_path, ARCHIVE_FLUSH_ROWS))
+        elif sink_name:
+            raise ValueError(f"Invalid output sink: {sink_name}")
+
+    return sinks
+
+
+def sync_sheet():
+    """ Copy to the output sheet the rows of the local database
+    not copied in previous syncs """
+
+    print("Syncing local database with the output sheet...")
+
+    sqlite_sink = SqliteSink(output_db_path)
+    sheets_sink = SheetsSink(GOOGLE_SHEET_LINK, creds_path, SHEET_OUTPUT)
+    try:
+        rows_synced = sqlite_sink.sync_to(sheets_sink)
+    finally:
+        sqlite_sink.close()
+
+    print(f"Rows synced: {rows_synced}")
+
+
+def get_start_date(case_types: list[str], case_index: CaseIndex) -> str:
+    """ Return the start date of a search: the watermark of its case types
+    (incremental mode), or 'START_DATE'
+
+    Args:
+        case_types (list[str]): case types of the search
+        case_index (CaseIndex): index of exported cases
+
+    Returns:
+        str: start date in format "mm/dd/yyyy"
+    """
+
+    if not INCREMENTAL:
+        return START_DATE
+
+    # Use the oldest watermark of the case types (all need to be updated)
+    watermarks = [case_index.get_watermark(case_type) for case_type in case_types]
+    if not all(watermarks):
+        return START_DATE
+
+    dates = [datetime.strptime(watermark, DATE_FORMAT) for watermark in watermarks]
+    return min(dates).strftime(DATE_FORMAT)
 
-    data_manager = DataManager(GOOGLE_SHEET_LINK, creds_path, SHEET_OUTPUT)
 
-    # Start scraper
-    scraper = Scraper(USER_EMAIL, USER_PASSWORD, not SHOW_BROWSER, debug=DEBUG)
-    scraper.login()
-    scraper.open_advanced_search()
-    
+def is_window_done(start_date: str, end_date: str, case_types: list[str],
+                   checkpoints: CheckpointStore) -> bool:
+    """ Return True if all the pages of a dates window are written
+    (the search and its pages ranges, when it was split)
+
+    Args:
+        start_date (str): start date in format "mm/dd/yyyy"
+        end_date (str): end date in format "mm/dd/yyyy"
+        case_types (list[str]): case types of the search
+        checkpoints (CheckpointStore): progress of the searches
+
+    Returns:
+        bool: True if the window is done
+    """
+
+    key = CheckpointStore.get_key(start_date, end_date, case_types)
+    checkpoint = checkpoints.get(key)
+    if not checkpoint["done"]:
+        return False
+
+    if not PAGES_PER_TASK or not checkpoint["pages"]:
+        return True
+
+    return all(
+        checkpoints.get(CheckpointStore.get_key(
+            start_date, end_date, case_types, first_page))["done"]
+        for first_page in range(PAGES_PER_TASK + 1, checkpoint["pages"] + 1,
+                                PAGES_PER_TASK)
+    )
+
+
+def save_search_done(search: tuple, checkpoints: CheckpointStore,
+                     case_index: CaseIndex = None):
+    """ Save a search (or pages range) as completed, and its dates window
+    in the index when all its pages are written (to move the watermarks)
+
+    Args:
+        search (tuple): start date, end date, case types, first page and
+            last page of the search
+        checkpoints (CheckpointStore): progress of the searches
+        case_index (CaseIndex): index of exported cases
+    """
+
+    start_date, end_date, case_types, first_page, _ = search
+    checkpoints.save_done(
+        CheckpointStore.get_key(start_date, end_date, case_types, first_page))
+
+    if case_index and is_window_done(start_date, end_date, case_types, checkpoints):
+        case_index.complete_window(case_types, start_date, end_date)
+
+
+def queue_page_ranges(start_date: str, end_date: str, case_types: list[str],
+                      pages_num: int, searches: Queue, checkpoints: CheckpointStore):
+    """ Queue the pages of a search after the first 'PAGES_PER_TASK' pages,
+    in ranges of 'PAGES_PER_TASK' pages (except the completed ones)
+
+    Args:
+        start_date (str): start date in format "mm/dd/yyyy"
+        end_date (str): end date in format "mm/dd/yyyy"
+        case_types (list[str]): case types to search
+        pages_num (int): total pages of the search
+        searches (Queue): pending searches
+        checkpoints (CheckpointStore): progress of the searches
+    """
+
+    for first_page in range(PAGES_PER_TASK + 1, pages_num + 1, PAGES_PER_TASK):
+        key = CheckpointStore.get_key(start_date, end_date, case_types, first_page)
+        if checkpoints.get(key)["done"]:
+            continue
+
+        last_page = min(first_page + PAGES_PER_TASK - 1, pages_num)
+        searches.put((start_date, end_date, case_types, first_page, last_page))
+
+
+def requeue_search(search: tuple, searches: Queue, checkpoints: CheckpointStore):
+    """ Queue again an interrupted search (it resumes after its last page saved)
+
+    Args:
+        search (tuple): start date, end date, case types, first page and
+            last page (0 for all the pages) of the search
+        searches (Queue): pending searches
+        checkpoints (CheckpointStore): progress of the searches
+    """
+
+    start_date, end_date, case_types, first_page, last_page = search
+
+    # The next pages ranges were already queued: keep only the first one
+    key = CheckpointStore.get_key(start_date, end_date, case_types, first_page)
+    if PAGES_PER_TASK and not last_page and checkpoints.get(key)["pages"]:
+        last_page = PAGES_PER_TASK
+
+    searches.put((start_date, end_date, case_types, first_page, last_page))
+
+
+def get_api_scraper(scraper: Scraper) -> ApiScraper:
+    """ Return an api scraper with the session of a logged in browser
+
+    Args:
+        scraper (Scraper): logged in scraper
+
+    Returns:
+        ApiScraper: api scraper of the site in 'HOME_PAGE'
+    """
+
+    home_page_url = urlsplit(HOME_PAGE)
+    return ApiScraper.from_browser(
+        scraper,
+        base_url=f"{home_page_url.scheme}://{home_page_url.netloc}/"
+    )
+
+
+def scrape_search(scraper: Scraper, search: tuple, searches: Queue,
+                  writer: OutputWriter, checkpoints: CheckpointStore,
+                  case_index: CaseIndex = None):
+    """ Scrape the results pages of a search (dates window and case types),
+    starting after the last page saved in its checkpoint
+
+    Args:
+        scraper (Scraper): logged in scraper
+        search (tuple): start date, end date, case types, first page and
+            last page (0 for all the pages) of the search
+        searches (Queue): pending searches (to queue the pages for other workers)
+        writer (OutputWriter): writer of the scraped data
+        checkpoints (CheckpointStore): progress of the searches
+        case_index (CaseIndex): index of exported cases (incremental mode)
+    """
+
+    start_date, end_date, case_types, first_page, last_page = search
+    key = CheckpointStore.get_key(start_date, end_date, case_types, first_page)
+    checkpoint = checkpoints.get(key)
+    start_page = max(first_page, checkpoint["last_page"] + 1)
+
+    print(f"\nScraping cases: {start_date} - {end_date} (from page {start_page})")
+
     # Filter cases and submit search
-    scraper.filter(START_DATE, END_DATE)
+    scraper.new_search(case_types)
+    scraper.filter(start_date, end_date)
     scraper.submit()
-    
+
+    # Sort newest first, to stop in the first page with only exported cases
+    stop_on_exported = False
+    if INCREMENTAL and case_index:
+        stop_on_exported = scraper.sort_by_filed_date()
+
+    # Share the next pages with the other workers (only when the number
+    # of pages is known: else, all the pages are scraped by this worker)
+    if PAGES_PER_TASK and not last_page:
+        pages_num = scraper.get_last_page()
+        if pages_num is None:
+            print("\tUnknown number of pages: the search is not split")
+        else:
+            checkpoints.save_pages(key, pages_num)
+            queue_page_ranges(start_date, end_date, case_types, pages_num,
+                              searches, checkpoints)
+            last_page = PAGES_PER_TASK
+
+    # Jump to the first page not saved
+    if last_page and start_page > last_page:
+        has_page = False
+    else:
+        has_page = start_page == 1 or scraper.go_to_page(start_page)
+
     # Get cases data and save to excel
-    while True:
-        
-        # Get cases data
+    while has_page:
+
+        # Get cases data (an empty page can be a lost session)
         cases_data = scraper.get_current_cases_data()
         if not cases_data:
+            scraper.check_session()
             break
-        
-        # Save data to excel
-        data_manager.write_output_data(cases_data)
-        sleep(2)
-        
-        # Go to the next
-        has_next_page = scraper.go_next_page()
-        if not has_next_page:
-            print("No more pages to scrape.")
+
+        # Older pages are already exported
+        if stop_on_exported and not case_index.filter_new(cases_data):
+            print("All the cases in this page are already exported.")
             break
 
+        # Save data to excel (and the checkpoint, after writing it)
+        writer.put(
+            cases_data,
+            on_written=partial(checkpoints.save_page, key, scraper.current_page),
+            metadata={"page": scraper.current_page, "shard": key},
+        )
+
+        # Stop at the end of the pages range
+        if last_page and scraper.current_page >= last_page:
+            break
+
+        # Go to the next
+        has_page = scraper.go_next_page()
+
+    print("No more pages to scrape.")
+
+    # Mark search as completed, after writing all the pages
+    writer.put(
+        [], on_written=lambda _: save_search_done(search, checkpoints, case_index))
+
+
+def scrape_search_api(api_scraper: ApiScraper, search: tuple,
+                      writer: OutputWriter, checkpoints: CheckpointStore,
+                      case_index: CaseIndex = None, scraper: Scraper = None):
+    """ Scrape the results pages of a search, calling the api directly
+
+    Args:
+        api_scraper (ApiScraper): api scraper with a logged in session
+        search (tuple): start date, end date, case types, first page and
+            last page (0 for all the pages) of the search
+        writer (OutputWriter): writer of the scraped data
+        checkpoints (CheckpointStore): progress of the searches
+        case_index (CaseIndex): index of exported cases (for the watermarks)
+        scraper (Scraper): browser of the session, to check it in an empty page
+    """
+
+    start_date, end_date, case_types, first_page, last_page = search
+    key = CheckpointStore.get_key(start_date, end_date, case_types, first_page)
+    checkpoint = checkpoints.get(key)
+    start_page = max(first_page, checkpoint["last_page"] + 1)
+
+    print(f"\nRequesting cases: {start_date} - {end_date} (from page {start_page})")
+
+    # An empty page can be a lost session: check it in the browser
+    check_session = None
+    if scraper:
+        check_session = partial(scraper.check_session, reload=True)
+
+    for page, cases_data in api_scraper.get_cases_pages(
+            start_date, end_date, case_types, start_page, last_page, check_session):
+        writer.put(
+            cases_data,
+            on_written=partial(checkpoints.save_page, key, page),
+            metadata={"page": page, "shard": key},
+        )
+
+    writer.put(
+        [], on_written=lambda _: save_search_done(search, checkpoints, case_index))
+
+
+def run_worker(searches: Queue, writer: OutputWriter, checkpoints: CheckpointStore,
+               account_pool: AccountPool, session_store: SessionStore,
+               case_index: CaseIndex = None, lost_sessions: dict = None):
+    """ Login once (with a free account of the pool) and scrape searches from
+    the queue, until all are done. The searches interrupted by a lost session
+    are queued again, after login again (up to 'MAX_SESSION_LOSSES' times)
+
+    Args:
+        searches (Queue): pending searches (start date, end date, case types,
+            first page, last page)
+        writer (OutputWriter): writer of the scraped data
+        checkpoints (CheckpointStore): progress of the searches
+        account_pool (AccountPool): accounts of the workers
+        session_store (SessionStore): login sessions shared by the workers
+        case_index (CaseIndex): index of exported cases (incremental mode)
+        lost_sessions (dict): sessions lost by each search (key of the
+            checkpoint), shared by the workers
+
+    Raises:
+        LoginError: if the account can not login (it is dropped from the pool)
+        SessionLostError: if a search lost the session too many times, like
+            when the account is in use elsewhere (it is dropped from the pool)
+    """
+
+    if lost_sessions is None:
+        lost_sessions = {}
+
+    # Own account (a single live session for each account)
+    with account_pool.account() as (user_email, user_password):
+
+        # Warm chrome profile of the account (cache and session of previous runs)
+        chrome_folder = ""
+        if CHROME_PROFILES:
+            account_hash = hashlib.sha1(user_email.encode()).hexdigest()[:12]
+            chrome_folder = os.path.join(chrome_profiles_folder, f"account_{account_hash}")
+
+        scraper = Scraper(user_email, user_password, not SHOW_BROWSER, debug=DEBUG,
+                          network_extraction=NETWORK_EXTRACTION,
+                          screenshots_rate=SCREENSHOTS_RATE,
+                          diagnostics_folder=diagnostics_folder,
+                          profile_commands=PROFILE_COMMANDS,
+                          block_resources=BLOCK_RESOURCES,
+                          page_load_strategy=PAGE_LOAD_STRATEGY,
+                          navigation_budget=NAVIGATION_BUDGET,
+                          chrome_folder=chrome_folder,
+                          session_store=session_store,
+                          home_page=HOME_PAGE)
+
+        try:
+            scraper.login()
+
+            # Reuse the browser session in the api engine
+            api_scraper = None
+            if ENGINE == "api":
+                api_scraper = get_api_scraper(scraper)
+
+            while True:
+
+                # Wait for new searches while other workers are still running
+                # (they can queue pages of their searches)
+                try:
+                    search = searches.get(timeout=1)
+                except Empty:
+                    if searches.unfinished_tasks == 0:
+                        break
+                    continue
+
+                try:
+                    if api_scraper:
+                        scrape_search_api(api_scraper, search, writer, checkpoints,
+                                          case_index, scraper)
+                    else:
+                        try:
+                            scrape_search(scraper, search, searches, writer,
+                                          checkpoints, case_index)
+                        except Exception:
+                            # Report the errors of a lost session as such
+                            scraper.check_session()
+                            raise
+                except (SessionLostError, SessionExpiredError) as error:
+
+                    # Each login ends the other sessions of the account: stop
+                    # if it is in use elsewhere (other bot or a person)
+                    key = CheckpointStore.get_key(*search[:4])
+                    lost_sessions[key] = lost_sessions.get(key, 0) + 1
+                    if lost_sessions[key] > MAX_SESSION_LOSSES:
+                        account_pool.drop(user_email)
+                        raise SessionLostError(
+                            f"The session of '{user_email}' was lost "
+                            f"{lost_sessions[key]} times in the same search. "
+                            "Check that the account is not in use elsewhere."
+                        ) from error
+
+                    print(f"\t{error}. Login again and retry the search...")
+
+                    # Resume the search after its pages already scraped
+                    writer.flush()
+                    requeue_search(search, searches, checkpoints)
+
+                    scraper.login()
+                    if api_scraper:
+                        api_scraper = get_api_scraper(scraper)
+                finally:
+                    searches.task_done()
+        except LoginError:
+            # Keep the other workers running, without this account
+            account_pool.drop(user_email)
+            raise
+        finally:
+            # Save the webdriver commands profile of the worker
+            if scraper.profiler:
+                worker_name = threading.current_thread().name
+                scraper.profiler.save_report(
+                    os.path.join(profiles_folder, f"{worker_name}.json"))
+                print(scraper.profiler.get_hot_spots_text(10))
+
+            scraper.kill()
+
+
+def run_searches(searches: Queue, data_manager: DataManager,
+                 checkpoints: CheckpointStore):
+    """ Scrape the queued searches with the workers, writing the data
+    in background
+
+    Args:
+        searches (Queue): pending searches
+        data_manager (DataManager): data manager used to write the data
+        checkpoints (CheckpointStore): progress of the searches
+    """
+
+    # Save data in background, while the next pages are scraped
+    writer = OutputWriter(data_manager)
+    writer.start()
+
+    # Accounts of the workers, and their sessions (shared while valid)
+    account_pool = AccountPool(get_accounts())
+    session_store = SessionStore(sessions_path, session_cookies=SESSION_COOKIES)
+
+    # Sessions lost by each search (retries of all the workers)
+    lost_sessions = {}
+
+    try:
+        # Pages of each search can be shared between workers
+        workers_num = WORKERS
+        if not PAGES_PER_TASK:
+            workers_num = min(WORKERS, searches.qsize())
+
+        # One worker for each account (the site ends the other sessions)
+        if workers_num > account_pool.size:
+            print(f"Only {account_pool.size} accounts: using {account_pool.size} workers")
+            workers_num = account_pool.size
+
+        with ThreadPoolExecutor(max_workers=workers_num) as executor:
+            futures = [
+                executor.submit(run_worker, searches, writer, checkpoints,
+                                account_pool, session_store, data_manager.case_index,
+                                lost_sessions)
+                for _ in range(workers_num)
+            ]
+
+            # Raise errors of the workers
+            for future in futures:
+                future.result()
+    finally:
+        # Write pending pages
+        writer.close()
+
+
+def main():
+    # Main workflow: scrape each ready case from the input sheet,
+    # update the output sheet with the scraped data, and update the status
+
+    # Header
+    print("\n----------------------------------")
+    print("TXCourts (Advance) Research Bot")
+    print("----------------------------------\n")
+
+    if ENGINE == "api":
+        print("WARNING: the api engine is experimental: its requests are not "
+              "verified against the site yet\n")
+    if MULTI_SELECT_CASE_TYPES:
+        print("WARNING: several case types in each search is experimental: the "
+              "case type selector is not verified against the site yet\n")
+
+    # Save the metrics of the run periodically (and at the end)
+    reporter = MetricsReporter(
+        metrics,
+        os.path.join(metrics_folder, "report.json"),
+        os.path.join(metrics_folder, "txcourts_bot.prom"),
+        METRICS_INTERVAL
+    )
+    reporter.start()
+
+    try:
+        data_manager = DataManager(
+            get_output_sinks(),
+            index_path=case_index_path if CASE_INDEX else None
+        )
+
+        # Group case types: all in the same search, or one search for each one
+        case_types = get_case_types()
+        if MULTI_SELECT_CASE_TYPES:
+            case_types_groups = [case_types]
+        else:
+            case_types_groups = [[case_type] for case_type in case_types]
+
+        # Load progress of the previous run (or start a new one)
+        checkpoints = CheckpointStore(checkpoints_path)
+        if not RESUME:
+            checkpoints.clear()
+
+        # Queue a search for each dates window and case types group
+        # (except the ones completed in the previous run)
+        searches = Queue()
+        last_date = END_DATE or datetime.now().strftime(DATE_FORMAT)
+        for case_types_group in case_types_groups:
+            first_date = get_start_date(case_types_group, data_manager.case_index)
+            date_ranges = split_date_range(first_date, last_date, SHARD_SIZE)
+            for start_date, end_date in date_ranges:
+
+                # Windows of the run, to move the watermarks when they are done
+                if data_manager.case_index:
+                    data_manager.case_index.add_window(
+                        case_types_group, start_date, end_date,
+                        is_window_done(start_date, end_date, case_types_group,
+                                       checkpoints)
+                    )
+
+                key = CheckpointStore.get_key(start_date, end_date, case_types_group)
+                checkpoint = checkpoints.get(key)
+                if not checkpoint["done"]:
+                    searches.put((start_date, end_date, case_types_group, 1, 0))
+                    continue
+
+                print(f"Skipping completed search: {start_date} - {end_date}")
+
+                # Queue the pages of the search not completed by other workers
+                if PAGES_PER_TASK and checkpoint["pages"]:
+                    queue_page_ranges(start_date, end_date, case_types_group,
+                                      checkpoint["pages"], searches, checkpoints)
+
+        if searches.empty():
+            print("All the searches are completed.")
+        else:
+            run_searches(searches, data_manager, checkpoints)
+        data_manager.close()
+
+        # Copy the local output to the sheet
+        if SYNC_SHEET:
+            sync_sheet()
+
+    finally:
+        reporter.close()
+
 
 if __name__ == "__main__":
     main()
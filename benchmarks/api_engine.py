@@ -0,0 +1,106 @@
+""" Measure the per page cost of the api engine (ApiScraper), against a
+local stand-in server that serves a sample search response.
+
+The sample (fixtures/search_results.json) is made up: it follows the
+contract assumed by ApiScraper, not a response captured from the site.
+
+Usage: python -m benchmarks.api_engine [pages]
+"""
+
+import os
+import sys
+import json
+import threading
+from time import perf_counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from libs.scraper_api import ApiScraper
+
+# Paths
+current_path = os.path.dirname(os.path.abspath(__file__))
+fixture_path = os.path.join(current_path, "fixtures", "search_results.json")
+
+
+class SampleApiHandler(BaseHTTPRequestHandler):
+    """ Serve the sample search response, for any requested page """
+
+    sample = {}
+    pages = 10
+
+    def do_POST(self):
+
+        # Validate path and session cookie
+        if self.path.strip("/") != ApiScraper.paths["search"]:
+            self.send_error(404)
+            return
+        if "session=" not in self.headers.get("Cookie", ""):
+            self.send_error(401)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        page = payload.get("page", 1)
+
+        response_data = dict(self.sample)
+        response_data["Page"] = page
+        response_data["TotalPages"] = self.pages
+        if page > self.pages:
+            response_data["Results"] = []
+
+        body = json.dumps(response_data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(pages: int) -> ThreadingHTTPServer:
+    """ Start the stand-in api server in a background thread
+
+    Args:
+        pages (int): total results pages served
+
+    Returns:
+        ThreadingHTTPServer: running server (random local port)
+    """
+
+    with open(fixture_path) as file:
+        SampleApiHandler.sample = json.load(file)
+    SampleApiHandler.pages = pages
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SampleApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    server = start_server(pages)
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+    cookies = [{"name": "session", "value": "benchmark", "domain": "127.0.0.1"}]
+    api_scraper = ApiScraper(cookies, base_url=base_url)
+
+    rows_num = 0
+    pages_num = 0
+    start = perf_counter()
+    for _, cases_data in api_scraper.get_cases_pages(
+            "01/01/2024", "12/31/2024", ["TAX DELINQUENCY"]):
+        pages_num += 1
+        rows_num += len(cases_data)
+    total = perf_counter() - start
+
+    server.shutdown()
+
+    print(f"Pages: {pages_num}, rows: {rows_num}")
+    print(f"Per page: {total / pages_num * 1000:.1f} ms")
+    print(f"Rows/sec: {rows_num / total:.0f}")
+
+
+if __name__ == "__main__":
+    main()
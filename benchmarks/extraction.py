@@ -0,0 +1,71 @@
+""" Compare the cost of the results page extraction modes of the scraper,
+against a local results page.
+
+The fixture (fixtures/results_page.html) is made up, not a capture of the
+site: its markup follows the results selectors of the scraper (like the
+case type column), so it does not verify them.
+
+Usage: python -m benchmarks.extraction [repetitions]
+"""
+
+import os
+import sys
+from time import perf_counter
+
+from libs.web_scraping import WebScraping
+from libs.scraper_extractor import Scraper
+
+# Paths
+current_path = os.path.dirname(os.path.abspath(__file__))
+fixture_path = os.path.join(current_path, "fixtures", "results_page.html")
+
+
+def measure(scraper: Scraper, extractor, repetitions: int) -> tuple[float, int, float]:
+    """ Run an extraction method several times
+
+    Args:
+        scraper (Scraper): scraper with the fixture loaded (and commands profiler)
+        extractor (callable): extraction method of the scraper
+        repetitions (int): number of runs
+
+    Returns:
+        tuple[float, int, float]: average seconds per page, rows extracted
+            and webdriver commands per page
+    """
+
+    commands_start = scraper.profiler.get_report()["commands"]
+    start = perf_counter()
+    for _ in range(repetitions):
+        _, cases_data = extractor(scraper)
+    total = perf_counter() - start
+    commands = scraper.profiler.get_report()["commands"] - commands_start
+
+    return total / repetitions, len(cases_data), commands / repetitions
+
+
+def main():
+
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    # Open the fixture without login (only the extraction is measured)
+    scraper = Scraper.__new__(Scraper)
+    WebScraping.__init__(scraper, headless=True, profile_commands=True)
+    scraper.set_page(f"file://{fixture_path}")
+
+    try:
+        by_row_time, by_row_rows, by_row_commands = measure(
+            scraper, Scraper.__get_cases_data_by_row__, repetitions)
+        bulk_time, bulk_rows, bulk_commands = measure(
+            scraper, Scraper.__get_cases_data_bulk__, repetitions)
+    finally:
+        scraper.kill(kill_terminal=False)
+
+    print(f"Rows per page: {by_row_rows} (bulk: {bulk_rows})")
+    print(f"By row: {by_row_time * 1000:.1f} ms per page, "
+          f"{by_row_commands:.0f} round trips")
+    print(f"Bulk: {bulk_time * 1000:.1f} ms per page, {bulk_commands:.0f} round trips")
+    print(f"Speedup: {by_row_time / bulk_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+""" In-memory fakes of the gspread spreadsheet and worksheet used by
+SheetsManager, that count every (simulated) api request """
+
+from collections import Counter
+from time import sleep
+
+from gspread.utils import a1_to_rowcol
+
+
+class FakeWorksheet ():
+    """ In-memory worksheet with the gspread methods used by the bot """
+
+    def __init__(self, title: str = "Sheet1", latency: float = 0):
+        """ Create an empty worksheet
+
+        Args:
+            title (str): worksheet name
+            latency (float): seconds to sleep in each api request
+        """
+
+        self.title = title
+        self.latency = latency
+        self.rows = []
+        self.calls = Counter()
+
+    def __request__(self, name: str):
+        """ Register an api request """
+
+        self.calls[name] += 1
+        if self.latency:
+            sleep(self.latency)
+
+    def __set_cell__(self, row: int, col: int, value):
+        """ Save a value in the grid (1-based row and column) """
+
+        while len(self.rows) < row:
+            self.rows.append([])
+        row_data = self.rows[row - 1]
+        while len(row_data) < col:
+            row_data.append("")
+        row_data[col - 1] = value
+
+    @property
+    def requests_num(self) -> int:
+        """ Total api requests """
+
+        return sum(self.calls.values())
+
+    def update(self, range_name: str, values: list):
+        start_cell = range_name.split(":")[0]
+        start_row, start_col = a1_to_rowcol(start_cell)
+
+        self.__request__("update")
+        for row_offset, row_data in enumerate(values):
+            for col_offset, value in enumerate(row_data):
+                self.__set_cell__(start_row + row_offset, start_col + col_offset, value)
+
+    def update_cell(self, row: int, col: int, value):
+        self.__request__("update_cell")
+        self.__set_cell__(row, col, value)
+
+    def append_rows(self, values: list, **kwargs):
+        self.__request__("append_rows")
+        self.rows.extend([list(row_data) for row_data in values])
+
+    def col_values(self, col: int) -> list:
+        self.__request__("col_values")
+        values = [
+            row_data[col - 1] if len(row_data) >= col else ""
+            for row_data in self.rows
+        ]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def row_values(self, row: int) -> list:
+        self.__request__("row_values")
+        if row > len(self.rows):
+            return []
+        return list(self.rows[row - 1])
+
+    def batch_get(self, ranges: list, **kwargs) -> list:
+        self.__request__("batch_get")
+        result = []
+        for range_name in ranges:
+            start_cell, end_cell = range_name.split(":")
+            col = a1_to_rowcol(f"{start_cell.rstrip('0123456789')}1")[1]
+            result.append([
+                [row_data[col - 1]] if len(row_data) >= col else []
+                for row_data in self.rows
+            ])
+        return result
+
+    def get_all_records(self) -> list:
+        self.__request__("get_all_records")
+        if not self.rows:
+            return []
+        header = self.rows[0]
+        return [dict(zip(header, row_data)) for row_data in self.rows[1:]]
+
+    def delete_row(self, row: int):
+        self.__request__("delete_row")
+        if row <= len(self.rows):
+            del self.rows[row - 1]
+
+
+class FakeSpreadsheet ():
+    """ In-memory spreadsheet that creates worksheets on demand """
+
+    def __init__(self, latency: float = 0):
+        """
+        Args:
+            latency (float): seconds to sleep in each api request
+        """
+
+        self.latency = latency
+        self.worksheets = {}
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        if title not in self.worksheets:
+            self.worksheets[title] = FakeWorksheet(title, self.latency)
+        return self.worksheets[title]
+
+    @property
+    def sheet1(self) -> FakeWorksheet:
+        return self.worksheet("Sheet1")
+
+    @property
+    def requests_num(self) -> int:
+        """ Total api requests, in all the worksheets """
+
+        return sum(worksheet.requests_num for worksheet in self.worksheets.values())
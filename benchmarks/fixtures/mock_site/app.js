@@ -0,0 +1,368 @@
+// Local replica of the court records search pages used by the scraper
+// (same selectors and flow), served by benchmarks/mock_site.py
+
+const config = window.MOCK_CONFIG || {
+  latency: 200,
+  pageSize: 50,
+  loginPath: "CourtRecordsSearch/api/login",
+  searchPath: "CourtRecordsSearch/api/search/advanced",
+}
+
+const fieldOptions = ["Case Type", "Case Filed Date", "Case Number", "Party Name"]
+const caseTypes = [
+  "TAX DELINQUENCY",
+  "TAX DELINQUENCY - OTHER",
+  "QUIET TITLE",
+  "FORECLOSURE - OTHER",
+  "FORECLOSURE - HOME EQUITY-EXPEDITED",
+  "DEBT/CONTRACT - OTHER",
+  "OTHER CIVIL",
+  "OTHER PROPERTY",
+]
+
+const state = {
+  conditions: [],
+  page: 1,
+  sort: "",
+}
+
+// Minimal angular replacement: pending http requests (used by the scraper
+// to wait the searches) and the paginator scope
+const http = { pendingRequests: [] }
+const scope = {
+  totalPages: 0,
+  selectPage: page => loadPage(page),
+  $apply: callback => callback(),
+}
+window.angular = {
+  element: () => ({
+    injector: () => ({ get: () => http }),
+    scope: () => scope,
+  }),
+}
+
+// Utils
+
+function escapeHtml (text) {
+  const elem = document.createElement("span")
+  elem.textContent = text
+  return elem.innerHTML
+}
+
+function isLogged () {
+  return document.cookie.split("; ").some(cookie => cookie.startsWith("session="))
+}
+
+function trackRequest (promise) {
+  const token = {}
+  http.pendingRequests.push(token)
+  return promise.finally(() => {
+    http.pendingRequests.splice(http.pendingRequests.indexOf(token), 1)
+  })
+}
+
+function request (path, body) {
+  return trackRequest(
+    fetch(`/${path}`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(body),
+    }).then(response => response.ok ? response.json() : Promise.reject(response.status))
+  )
+}
+
+function delay () {
+  return trackRequest(new Promise(resolve => setTimeout(resolve, config.latency)))
+}
+
+// Home and login
+
+function renderNav () {
+  const navButtons = document.getElementById("navButtons")
+  if (isLogged()) {
+    navButtons.innerHTML = '<button id="btnAdvancedSearch">Advanced Search</button>'
+    document.getElementById("btnAdvancedSearch").addEventListener("click", renderSearch)
+  } else {
+    navButtons.innerHTML = '<a id="signInLink" href="#!">Sign In</a>'
+    document.getElementById("signInLink").addEventListener("click", event => {
+      event.preventDefault()
+      renderLogin()
+    })
+  }
+}
+
+function renderHome () {
+  renderNav()
+  const app = document.getElementById("app")
+  app.innerHTML = isLogged()
+    ? "<p>Welcome. Open the advanced search to find cases.</p>"
+    : "<p>Sign in to search cases.</p>"
+}
+
+function renderLogin () {
+  const app = document.getElementById("app")
+  app.innerHTML = `
+    <form id="loginForm">
+      <input id="UserName" type="email" placeholder="Email">
+      <input id="Password" type="password" placeholder="Password">
+      <button id="sign-in-btn" type="button">Sign In</button>
+      <div class="error"></div>
+    </form>
+  `
+  document.getElementById("sign-in-btn").addEventListener("click", () => {
+    request(config.loginPath, {
+      UserName: document.getElementById("UserName").value,
+      Password: document.getElementById("Password").value,
+    })
+      .then(renderHome)
+      .catch(() => {
+        app.querySelector(".error").textContent = "Invalid email or password"
+      })
+  })
+}
+
+// Advanced search
+
+function renderSearch () {
+  state.conditions = []
+  const app = document.getElementById("app")
+  app.innerHTML = `
+    <div id="conditions">
+      <div class="conditions-header">Search by</div>
+    </div>
+    <button id="btnAddCondition">Add Condition</button>
+    <button id="btnSearch">Search</button>
+    <div id="results"></div>
+  `
+  document.getElementById("btnAddCondition").addEventListener("click", addCondition)
+  document.getElementById("btnSearch").addEventListener("click", () => loadPage(1))
+  addCondition()
+}
+
+function addCondition () {
+  const condition = { fieldOption: "", values: [], row: null }
+  state.conditions.push(condition)
+
+  const row = document.createElement("div")
+  row.setAttribute("ng-repeat", "condition in conditions")
+  row.innerHTML = `
+    <select ng-model="condition.fieldOption">
+      <option value="">Select...</option>
+      ${fieldOptions.map(option => `<option>${option}</option>`).join("")}
+    </select>
+    <span class="condition-value"></span>
+  `
+  condition.row = row
+  document.getElementById("conditions").appendChild(row)
+
+  row.querySelector("select").addEventListener("change", event => {
+    condition.fieldOption = event.target.value
+    renderConditionValue(condition)
+  })
+}
+
+function renderConditionValue (condition) {
+  const valueElem = condition.row.querySelector(".condition-value")
+  if (condition.fieldOption === "Case Type") {
+    const typeIndex = state.conditions
+      .filter(other => other.fieldOption === "Case Type")
+      .indexOf(condition)
+    valueElem.innerHTML = `
+      <button id="selectionButton_${typeIndex}">Select</button>
+      <span class="selected-values"></span>
+    `
+    valueElem.querySelector("button").addEventListener(
+      "click", () => openSelection(condition)
+    )
+  } else if (condition.fieldOption === "Case Filed Date") {
+    valueElem.innerHTML = `
+      <input ng-model="condition.fromValue" placeholder="mm/dd/yyyy">
+      <input ng-model="condition.toValue" placeholder="mm/dd/yyyy">
+    `
+  } else {
+    valueElem.innerHTML = '<input ng-model="condition.value">'
+  }
+}
+
+function openSelection (condition) {
+  const dialog = document.createElement("div")
+  dialog.id = "selectionDialog"
+  dialog.className = "modal"
+  dialog.innerHTML = `
+    <input id="searchText" type="text">
+    <button id="searchSelectionButton">Search</button>
+    <div id="selectionResults"></div>
+    <button id="doneSelectionButton">Done</button>
+  `
+  document.body.appendChild(dialog)
+
+  const results = dialog.querySelector("#selectionResults")
+  dialog.querySelector("#searchSelectionButton").addEventListener("click", () => {
+    results.innerHTML = ""
+    const text = dialog.querySelector("#searchText").value.trim().toUpperCase()
+    delay().then(() => {
+      const options = caseTypes.filter(caseType => caseType.includes(text))
+      results.innerHTML = `
+        <label for="selectAllResults">Select all</label>
+        <input type="checkbox" id="selectAllResults">
+        ${options.map(option => `
+          <div>
+            <label>
+              <input type="checkbox" value="${escapeHtml(option)}"
+                ${condition.values.includes(option) ? "checked" : ""}>
+              ${escapeHtml(option)}
+            </label>
+          </div>
+        `).join("")}
+      `
+      const checkboxes = results.querySelectorAll("div input[type=checkbox]")
+      checkboxes.forEach(checkbox => {
+        checkbox.addEventListener("change", () => {
+          condition.values = condition.values.filter(value => value !== checkbox.value)
+          if (checkbox.checked) {
+            condition.values.push(checkbox.value)
+          }
+        })
+      })
+      results.querySelector("#selectAllResults").addEventListener("change", event => {
+        checkboxes.forEach(checkbox => {
+          if (checkbox.checked !== event.target.checked) {
+            checkbox.click()
+          }
+        })
+      })
+    })
+  })
+
+  dialog.querySelector("#doneSelectionButton").addEventListener("click", () => {
+    condition.row.querySelector(".selected-values").textContent = condition.values.join(", ")
+    dialog.remove()
+  })
+}
+
+function getSearchConditions () {
+  return state.conditions.map(condition => {
+    const data = { fieldOption: condition.fieldOption, values: condition.values }
+    const fromInput = condition.row.querySelector('[ng-model="condition.fromValue"]')
+    const toInput = condition.row.querySelector('[ng-model="condition.toValue"]')
+    if (fromInput && toInput) {
+      data.fromValue = fromInput.value
+      data.toValue = toInput.value
+    }
+    return data
+  })
+}
+
+// Results
+
+function loadPage (page) {
+  const results = document.getElementById("results")
+  results.innerHTML = '<div ng-if="IsLoading" class="spinner">Loading...</div>'
+
+  request(config.searchPath, {
+    conditions: getSearchConditions(),
+    page,
+    pageSize: config.pageSize,
+    sort: state.sort,
+  })
+    .then(data => {
+      state.page = data.Page
+      scope.totalPages = data.TotalPages
+      renderResults(data)
+    })
+    .catch(status => {
+      results.innerHTML = `<div class="error">Search error (${status})</div>`
+    })
+}
+
+function renderCase (caseData) {
+  return `
+    <div class="list-group-item">
+      <div class="card-body">
+        <h5 class="card-title"><a href="#!">${escapeHtml(caseData.CaseStyle)}</a></h5>
+        <div class="card-sub-header">${escapeHtml(caseData.CaseNumber)}</div>
+        <div class="row">
+          <div class="col-md-12"><span ng-bind="case.style">Case style</span></div>
+        </div>
+        <div class="row">
+          <div class="col-md-2"><span ng-bind="case.court">${escapeHtml(caseData.CourtName)}</span></div>
+          <div class="col-md-1">
+            <img class="court-seal" src="assets/seal.png?court=${encodeURIComponent(caseData.CourtName)}">
+          </div>
+          <div class="col-md-2"><span ng-bind="case.caseType">${escapeHtml(caseData.CaseType)}</span></div>
+          <div class="col-md-2"><span ng-bind="case.status">${escapeHtml(caseData.CaseStatus)}</span></div>
+          <div class="col-md-2"><span ng-bind="case.filedDate">${escapeHtml(caseData.FiledDate)}</span></div>
+        </div>
+      </div>
+    </div>
+  `
+}
+
+function renderPagination (page, totalPages) {
+  if (!totalPages) {
+    return ""
+  }
+
+  // Links of the first, last and near pages
+  const pages = []
+  for (let number = 1; number <= totalPages; number++) {
+    if (number === 1 || number === totalPages || Math.abs(number - page) <= 5) {
+      pages.push(number)
+    }
+  }
+
+  const previousClass = page <= 1 ? "disabled" : ""
+  const nextClass = page >= totalPages ? "disabled" : ""
+  return `
+    <ul class="pagination">
+      <li class="page-item ${previousClass}">
+        <a class="page-link" href="#!" data-page="${page - 1}"
+          ng-click="selectPage(page - 1, $event)">Previous</a>
+      </li>
+      ${pages.map(number => `
+        <li class="page-item ${number === page ? "active" : ""}">
+          <a class="page-link" href="#!" data-page="${number}"
+            ng-click="selectPage(${number}, $event)">${number}</a>
+        </li>
+      `).join("")}
+      <li class="page-item ${nextClass}">
+        <a class="page-link" href="#!" data-page="${page + 1}"
+          ng-click="selectPage(page + 1, $event)">Next</a>
+      </li>
+    </ul>
+  `
+}
+
+function renderResults (data) {
+  const results = document.getElementById("results")
+  results.innerHTML = `
+    <div class="results-header">
+      Sort by
+      <select ng-model="sortOption">
+        <option value="">Relevance</option>
+        <option value="filedDateAsc">Filed Date (Oldest)</option>
+        <option value="filedDateDesc">Filed Date (Newest)</option>
+      </select>
+    </div>
+    <div class="list-group">${data.Results.map(renderCase).join("")}</div>
+    ${renderPagination(data.Page, data.TotalPages)}
+  `
+
+  const sortSelect = results.querySelector('[ng-model="sortOption"]')
+  sortSelect.value = state.sort
+  sortSelect.addEventListener("change", () => {
+    state.sort = sortSelect.value
+    loadPage(1)
+  })
+
+  results.querySelectorAll(".page-link").forEach(link => {
+    link.addEventListener("click", event => {
+      event.preventDefault()
+      if (!link.parentElement.classList.contains("disabled")) {
+        loadPage(parseInt(link.dataset.page))
+      }
+    })
+  })
+}
+
+renderHome()
@@ -0,0 +1,145 @@
+""" Run the full bot flow (main: login, searches, pages and output) in a
+headless browser against the local mock site and the fake Google sheet,
+and report its throughput.
+
+Usage: python -m benchmarks.full_flow [pages] [rows_per_page] [latency_ms] [workers]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import importlib.util
+from time import perf_counter
+
+from libs.metrics import metrics
+from libs.output_sinks import SheetsSink
+from benchmarks.fake_sheets import FakeSpreadsheet
+from benchmarks.mock_site import start_mock_site, get_home_page
+
+# Paths
+current_path = os.path.dirname(os.path.abspath(__file__))
+bot_path = os.path.join(os.path.dirname(current_path), "__main__.py")
+
+
+def load_bot(env: dict):
+    """ Import the bot module (__main__.py) with the given env variables
+
+    Args:
+        env (dict): env variables of the run
+
+    Returns:
+        module: bot module
+    """
+
+    os.environ.update(env)
+    spec = importlib.util.spec_from_file_location("bot", bot_path)
+    bot = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bot)
+    return bot
+
+
+def get_profiles_commands(profiles_folder: str) -> tuple[int, int]:
+    """ Return the webdriver commands and pages of the workers profiles
+
+    Args:
+        profiles_folder (str): folder with the profiles of the workers
+
+    Returns:
+        tuple[int, int]: total commands and pages profiled
+    """
+
+    commands = 0
+    pages = 0
+    for file_name in os.listdir(profiles_folder):
+        with open(os.path.join(profiles_folder, file_name)) as file:
+            report = json.load(file)
+        commands += report["commands"]
+        pages += len(report["pages"])
+
+    return commands, pages
+
+
+def main():
+
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rows_per_page = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    latency = int(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.2
+    workers = sys.argv[4] if len(sys.argv) > 4 else "1"
+
+    server = start_mock_site(pages, rows_per_page, latency)
+    temp_folder = tempfile.TemporaryDirectory()
+
+    # Run settings (all the bot env variables, to ignore the local .env)
+    bot = load_bot({
+        "HOME_PAGE": get_home_page(server),
+        "USER_EMAIL": "benchmark@example.com",
+        "USER_PASSWORD": "benchmark",
+        "SHOW_BROWSER": "False",
+        "START_DATE": "01/01/2024",
+        "END_DATE": "12/31/2024",
+        "CASE_TYPES": "TAX DELINQUENCY,QUIET TITLE",
+        "MULTI_SELECT_CASE_TYPES": "False",
+        "DEBUG": "True",
+        "WORKERS": workers,
+        "SHARD_SIZE": "",
+        "ENGINE": "browser",
+        "NETWORK_EXTRACTION": "False",
+        "SCREENSHOTS_RATE": "0",
+        "RESUME": "False",
+        "PAGES_PER_TASK": "0",
+        "INCREMENTAL": "False",
+        "CASE_INDEX": "False",
+        "OUTPUT_SINKS": "sheets",
+        "SYNC_SHEET": "False",
+        "ARCHIVE_FLUSH_ROWS": "500",
+        "METRICS_INTERVAL": "3600",
+        "PROFILE_COMMANDS": "True",
+        "BLOCK_RESOURCES": "True",
+        "PAGE_LOAD_STRATEGY": "eager",
+        "NAVIGATION_BUDGET": "30",
+        "CHROME_PROFILES": "False",
+        "SESSION_COOKIES": "session",
+    })
+
+    # Keep the files of the run out of the project
+    bot.checkpoints_path = os.path.join(temp_folder.name, "checkpoints.json")
+    bot.metrics_folder = os.path.join(temp_folder.name, "metrics")
+    bot.diagnostics_folder = os.path.join(temp_folder.name, "diagnostics")
+    bot.profiles_folder = os.path.join(temp_folder.name, "profiles")
+    bot.sessions_path = os.path.join(temp_folder.name, "sessions.json")
+
+    # Write the output in the fake sheet
+    sheet = FakeSpreadsheet()
+    worksheet = sheet.worksheet("output")
+    bot.get_output_sinks = lambda: [SheetsSink("", "", "output", sheet=sheet)]
+
+    start = perf_counter()
+    try:
+        bot.main()
+    finally:
+        server.shutdown()
+    total = perf_counter() - start
+
+    report = metrics.get_report()
+    pages_num = report["counters"].get("pages_scraped", 0)
+    rows_num = report["counters"].get("rows_written", 0)
+    commands, pages_profiled = get_profiles_commands(bot.profiles_folder)
+    temp_folder.cleanup()
+
+    print("\n----------------------------------")
+    print(f"Pages: {pages_num}, rows written: {rows_num}, time: {total:.1f} s")
+    print(f"Pages/sec: {pages_num / total:.2f}")
+    print(f"Rows/sec: {rows_num / total:.1f}")
+    print(f"WebDriver commands per page: {commands / max(pages_profiled, 1):.1f} "
+          "(including login and searches)")
+    print(f"Sheets api requests per page: {worksheet.requests_num / max(pages_num, 1):.2f}")
+    print("Slowest phases:")
+    phases = sorted(report["phases"].items(), key=lambda item: -item[1]["seconds"])
+    for phase, phase_data in phases[:5]:
+        print(f"\t{phase}: {phase_data['seconds']:.2f} s "
+              f"({phase_data['calls']} calls, avg {phase_data['avg_seconds'] * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+""" Local mock of the court records search site: the pages driven by the
+scraper (login, advanced search, case type selection and paginated results,
+in fixtures/mock_site) and its json api, with generated cases and a
+configurable latency.
+
+Usage: python -m benchmarks.mock_site [port] [pages] [rows_per_page] [latency_ms]
+Then run the bot with HOME_PAGE=http://127.0.0.1:<port>/CourtRecordsSearch/#!
+"""
+
+import os
+import sys
+import json
+import zlib
+import threading
+from time import sleep
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from libs.scraper_api import ApiScraper
+from libs.date_ranges import DATE_FORMAT
+
+# Paths
+current_path = os.path.dirname(os.path.abspath(__file__))
+site_folder = os.path.join(current_path, "fixtures", "mock_site")
+
+# Site paths
+home_path = "CourtRecordsSearch/"
+login_path = "CourtRecordsSearch/api/login"
+search_path = ApiScraper.paths["search"]
+
+
+class MockSiteHandler(BaseHTTPRequestHandler):
+    """ Serve the mock pages and api """
+
+    # Settings (shared by all the requests)
+    pages = 10
+    rows_per_page = 50
+    latency = 0.2
+
+    # Static files of the site
+    static_files = {
+        home_path: ("index.html", "text/html"),
+        f"{home_path}app.js": ("app.js", "application/javascript"),
+    }
+
+    # Assets (generated content): size in kb and content type.
+    # Cacheable, like in the real site
+    assets = {
+        f"{home_path}assets/site.css": (4, "text/css"),
+        f"{home_path}assets/logo.png": (60, "image/png"),
+        f"{home_path}assets/seal.png": (20, "image/png"),
+        f"{home_path}assets/court-sans.woff2": (90, "font/woff2"),
+    }
+
+    # Courts of the generated cases
+    courts = [
+        "Harris County - 55th District Court",
+        "Dallas County - 44th District Court",
+        "Bexar County - 150th District Court",
+        "Travis County - 353rd District Court",
+        "Tarrant County - 17th District Court",
+    ]
+
+    def __send__(self, body: bytes, content_type: str, headers: dict = {}):
+        """ Send a 200 response """
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+
+        path = self.path.split("?")[0].lstrip("/")
+
+        # Settings of the page
+        if path == f"{home_path}config.js":
+            settings = {
+                "latency": int(self.latency * 1000),
+                "pageSize": self.rows_per_page,
+                "loginPath": login_path,
+                "searchPath": search_path,
+            }
+            body = f"window.MOCK_CONFIG = {json.dumps(settings)}".encode()
+            self.__send__(body, "application/javascript")
+            return
+
+        if path in self.assets:
+            size, content_type = self.assets[path]
+
+            # Filler content of the asset size (the css must stay valid)
+            filler = b" " if content_type == "text/css" else bytes(range(256))
+            body = filler * (size * 1024 // len(filler))
+            self.__send__(body, content_type, {"Cache-Control": "max-age=3600"})
+            return
+
+        if path not in self.static_files:
+            self.send_error(404)
+            return
+
+        file_name, content_type = self.static_files[path]
+        with open(os.path.join(site_folder, file_name), "rb") as file:
+            self.__send__(file.read(), content_type)
+
+    def do_POST(self):
+
+        path = self.path.split("?")[0].lstrip("/")
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        sleep(self.latency)
+
+        # Login: any email and password
+        if path == login_path:
+            if not payload.get("UserName") or not payload.get("Password"):
+                self.send_error(401)
+                return
+            body = json.dumps({"success": True}).encode()
+            self.__send__(body, "application/json", {
+                "Set-Cookie": "session=mock-session; Path=/"
+            })
+            return
+
+        if path != search_path:
+            self.send_error(404)
+            return
+
+        # Search (same response for the page and the api engine)
+        if "session=" not in self.headers.get("Cookie", ""):
+            self.send_error(401)
+            return
+
+        body = json.dumps(self.get_search_response(payload)).encode()
+        self.__send__(body, "application/json")
+
+    def get_search_response(self, payload: dict) -> dict:
+        """ Generate the cases of a results page (same cases for the same search)
+
+        Args:
+            payload (dict): search request, like ApiScraper.get_search_payload
+
+        Returns:
+            dict: search response (keys of ApiScraper.response_keys)
+        """
+
+        # Read conditions
+        case_types = ["TAX DELINQUENCY"]
+        start_date = end_date = datetime.now()
+        for condition in payload.get("conditions", []):
+            if condition.get("fieldOption") == "Case Type" and condition.get("values"):
+                case_types = condition["values"]
+            if condition.get("fieldOption") == "Case Filed Date":
+                try:
+                    start_date = datetime.strptime(condition["fromValue"], DATE_FORMAT)
+                    end_date = datetime.strptime(condition["toValue"], DATE_FORMAT)
+                except (KeyError, ValueError):
+                    pass
+
+        page = int(payload.get("page") or 1)
+        total = self.pages * self.rows_per_page
+        search_id = zlib.crc32(json.dumps(payload.get("conditions", [])).encode())
+        days = max((end_date - start_date).days, 0)
+
+        cases = []
+        first_index = (page - 1) * self.rows_per_page
+        for index in range(first_index, min(first_index + self.rows_per_page, total)):
+
+            # Filed dates from the newest, when sorted descending
+            date_index = total - 1 - index if payload.get("sort") == "filedDateDesc" else index
+            filed_date = start_date + timedelta(days=days * date_index // max(total - 1, 1))
+
+            cases.append({
+                "CaseNumber": f"{filed_date.year}-{search_id % 10000:04d}{date_index:05d}-CV",
+                "CaseStyle": f"COUNTY OF HARRIS VS. DEFENDANT {date_index}",
+                "CourtName": self.courts[date_index % len(self.courts)],
+                "CaseType": case_types[date_index % len(case_types)],
+                "FiledDate": filed_date.strftime(DATE_FORMAT),
+                "CaseStatus": "Active",
+            })
+
+        return {
+            "Page": page,
+            "PageSize": self.rows_per_page,
+            "TotalPages": self.pages,
+            "TotalResults": total,
+            "Results": cases,
+        }
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_site(pages: int = 10, rows_per_page: int = 50, latency: float = 0.2,
+                    port: int = 0) -> ThreadingHTTPServer:
+    """ Start the mock site in a background thread
+
+    Args:
+        pages (int): results pages of each search
+        rows_per_page (int): cases in each results page
+        latency (float): seconds to answer each api request
+        port (int): local port (0 for a random one)
+
+    Returns:
+        ThreadingHTTPServer: running server
+    """
+
+    MockSiteHandler.pages = pages
+    MockSiteHandler.rows_per_page = rows_per_page
+    MockSiteHandler.latency = latency
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockSiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def get_home_page(server: ThreadingHTTPServer) -> str:
+    """ Return the home page url of a running mock site """
+
+    return f"http://127.0.0.1:{server.server_port}/{home_path}#!"
+
+
+def main():
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8800
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rows_per_page = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    latency = int(sys.argv[4]) / 1000 if len(sys.argv) > 4 else 0.2
+
+    server = start_mock_site(pages, rows_per_page, latency, port)
+    print(f"Mock site running in: {get_home_page(server)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+""" Measure the bytes downloaded and the time of the home page and of each
+results page, with and without blocking images, fonts and trackers in the
+browser, against the local mock site.
+
+The "http" mode (without a browser) requests the same documents and
+resources that the browser downloads from the mock site (caching the
+cacheable ones, like the browser), skipping the urls that match
+WebScraping.blocked_urls. Its times are sequential requests, not a
+browser page load.
+
+Usage: python -m benchmarks.resource_blocking [pages] [latency_ms] [browser|http]
+"""
+
+import os
+import re
+import sys
+import tempfile
+from time import perf_counter
+from fnmatch import fnmatchcase
+from urllib.parse import urljoin, quote
+
+import requests
+
+from libs import scraper_login
+from libs.web_scraping import WebScraping
+from libs.scraper_extractor import Scraper
+from benchmarks.mock_site import (
+    start_mock_site, get_home_page, login_path, search_path
+)
+
+
+def get_transferred_bytes(scraper: Scraper) -> int:
+    """ Return the bytes downloaded by the current document (page and resources) """
+
+    script = """
+    const entries = performance.getEntriesByType("navigation")
+        .concat(performance.getEntriesByType("resource"))
+    return entries.reduce((total, entry) => total + entry.transferSize, 0)
+    """
+    return scraper.driver.execute_script(script)
+
+
+def measure(home_page: str, block_resources: bool, loads: int = 3) -> dict:
+    """ Load the home page several times and scrape all the pages of a search
+
+    Args:
+        home_page (str): home page of the mock site
+        block_resources (bool): block images, fonts and trackers
+        loads (int): home page loads
+
+    Returns:
+        dict: home_seconds, home_bytes, page_seconds, page_bytes and pages
+    """
+
+    scraper = Scraper(
+        "benchmark@example.com", "benchmark", headless=True, debug=True,
+        block_resources=block_resources, home_page=home_page,
+    )
+
+    try:
+        scraper.login()
+
+        # Home page (full load, from a blank page)
+        home_seconds = 0
+        home_bytes = 0
+        for _ in range(loads):
+            scraper.set_page("about:blank")
+            start = perf_counter()
+            scraper.__set_home_page__()
+            home_seconds += perf_counter() - start
+            home_bytes += get_transferred_bytes(scraper)
+
+        # Results pages (same document, only the new resources are counted)
+        scraper.new_search(["TAX DELINQUENCY"])
+        scraper.filter("01/01/2024", "12/31/2024")
+        scraper.driver.execute_script("performance.setResourceTimingBufferSize(100000)")
+        bytes_start = get_transferred_bytes(scraper)
+
+        pages = 0
+        start = perf_counter()
+        scraper.submit()
+        while scraper.get_current_cases_data():
+            pages += 1
+            if not scraper.go_next_page():
+                break
+        page_seconds = perf_counter() - start
+        page_bytes = get_transferred_bytes(scraper) - bytes_start
+    finally:
+        scraper.kill()
+
+    return {
+        "home_seconds": home_seconds / loads,
+        "home_bytes": home_bytes / loads,
+        "page_seconds": page_seconds / max(pages, 1),
+        "page_bytes": page_bytes / max(pages, 1),
+        "pages": pages,
+    }
+
+
+class HttpBrowser ():
+    """ Requests of the browser to the mock site (without running a browser):
+    documents and resources, with the cache and the blocked urls """
+
+    def __init__(self, block_resources: bool):
+        """ Create the http session
+
+        Args:
+            block_resources (bool): skip the urls in 'WebScraping.blocked_urls'
+        """
+
+        self.block_resources = block_resources
+        self.session = requests.Session()
+        self.cache = set()
+        self.bytes = 0
+
+    def get(self, url: str) -> str:
+        """ Download an url (if it is not blocked or cached)
+
+        Args:
+            url (str): url to download
+
+        Returns:
+            str: response text (empty if skipped)
+        """
+
+        if self.block_resources and any(
+                fnmatchcase(url, pattern) for pattern in WebScraping.blocked_urls):
+            return ""
+        if url in self.cache:
+            return ""
+
+        response = self.session.get(url)
+        self.bytes += len(response.content)
+        if "max-age" in response.headers.get("Cache-Control", ""):
+            self.cache.add(url)
+        return response.text
+
+    def post(self, url: str, data: dict) -> dict:
+        """ Post json data to an url
+
+        Args:
+            url (str): url of the api
+            data (dict): json body
+
+        Returns:
+            dict: json response
+        """
+
+        response = self.session.post(url, json=data)
+        self.bytes += len(response.content)
+        return response.json()
+
+    def load_home_page(self, home_page: str):
+        """ Download the home page and its resources (styles, scripts,
+        images and the font of the page) """
+
+        html = self.get(home_page)
+        resources = re.findall(r'(?:src|href)="([^"#]+)"|url\("([^"]+)"\)', html)
+        for src, css_url in resources:
+            self.get(urljoin(home_page, src or css_url))
+
+
+def measure_http(home_page: str, block_resources: bool, pages: int,
+                 loads: int = 3) -> dict:
+    """ Like 'measure', requesting the browser downloads without a browser
+
+    Args:
+        home_page (str): home page of the mock site
+        block_resources (bool): skip images, fonts and trackers
+        pages (int): results pages of the search
+        loads (int): home page loads
+
+    Returns:
+        dict: home_seconds, home_bytes, page_seconds, page_bytes and pages
+    """
+
+    browser = HttpBrowser(block_resources)
+    site_url = urljoin(home_page, "/")
+    browser.post(urljoin(site_url, login_path),
+                 {"UserName": "benchmark@example.com", "Password": "benchmark"})
+
+    # Home page (the cacheable resources are downloaded only once)
+    start = perf_counter()
+    for _ in range(loads):
+        browser.load_home_page(home_page)
+    home_seconds = perf_counter() - start
+    home_bytes = browser.bytes
+
+    # Results pages: search response and the court seal of each card
+    browser.bytes = 0
+    start = perf_counter()
+    for page in range(1, pages + 1):
+        response_data = browser.post(urljoin(site_url, search_path), {
+            "conditions": [{"fieldOption": "Case Type", "values": ["TAX DELINQUENCY"]}],
+            "page": page,
+        })
+        for case_data in response_data["Results"]:
+            court = quote(case_data["CourtName"], safe="-_.!~*'()")
+            browser.get(urljoin(home_page, f"assets/seal.png?court={court}"))
+    page_seconds = perf_counter() - start
+
+    return {
+        "home_seconds": home_seconds / loads,
+        "home_bytes": home_bytes / loads,
+        "page_seconds": page_seconds / pages,
+        "page_bytes": browser.bytes / pages,
+        "pages": pages,
+    }
+
+
+def main():
+
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    latency = int(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.05
+    mode = sys.argv[3] if len(sys.argv) > 3 else "browser"
+
+    server = start_mock_site(pages, 50, latency)
+    home_page = get_home_page(server)
+
+    # Keep the sessions of the runs out of the project
+    temp_folder = tempfile.TemporaryDirectory()
+    scraper_login.sessions_path = os.path.join(temp_folder.name, "sessions.json")
+
+    try:
+        if mode == "http":
+            results = {
+                "all resources": measure_http(home_page, False, pages),
+                "blocked resources": measure_http(home_page, True, pages),
+            }
+        else:
+            results = {
+                "all resources": measure(home_page, False),
+                "blocked resources": measure(home_page, True),
+            }
+    finally:
+        server.shutdown()
+        temp_folder.cleanup()
+
+    print("\n----------------------------------")
+    for name, result in results.items():
+        print(f"{name} ({result['pages']} results pages):")
+        print(f"\tHome page: {result['home_bytes'] / 1024:.1f} kb, "
+              f"{result['home_seconds'] * 1000:.0f} ms")
+        print(f"\tResults page: {result['page_bytes'] / 1024:.1f} kb, "
+              f"{result['page_seconds'] * 1000:.0f} ms")
+
+    full = results["all resources"]
+    blocked = results["blocked resources"]
+    print(f"Saved per home page: {(full['home_bytes'] - blocked['home_bytes']) / 1024:.1f} kb, "
+          f"{(full['home_seconds'] - blocked['home_seconds']) * 1000:.0f} ms")
+    print(f"Saved per results page: {(full['page_bytes'] - blocked['page_bytes']) / 1024:.1f} kb, "
+          f"{(full['page_seconds'] - blocked['page_seconds']) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+""" Count the Google Sheets api requests used to write results pages,
+against an in-memory fake of the spreadsheet, and compare with the local
+sqlite sink.
+
+Usage: python -m benchmarks.sheets_writes [pages] [rows_per_page]
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from libs.data_manager import DataManager
+from libs.output_sinks import SheetsSink, SqliteSink
+from benchmarks.fake_sheets import FakeSpreadsheet
+
+
+def get_fake_page(page: int, rows_num: int) -> list[dict]:
+    """ Return fake cases data of a results page """
+
+    return [
+        {
+            "description": f"COUNTY VS. DEFENDANT {page}-{index}",
+            "number": f"{page:04d}-{index:04d}-CV",
+            "location": "Harris County - 55th District Court",
+            "type": "TAX DELINQUENCY",
+            "filed_date": "01/02/2024",
+        }
+        for index in range(rows_num)
+    ]
+
+
+def main():
+
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rows_num = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    sheet = FakeSpreadsheet()
+    data_manager = DataManager([SheetsSink("", "", "output", sheet=sheet)])
+    worksheet = sheet.worksheet("output")
+
+    start = perf_counter()
+    for page in range(pages):
+        data_manager.write_output_data(get_fake_page(page, rows_num))
+    total = perf_counter() - start
+
+    print(f"Pages: {pages}, rows per page: {rows_num}")
+    print(f"Rows in sheet: {len(worksheet.rows)}")
+    print(f"Api requests: {dict(worksheet.calls)}")
+    print(f"Api requests per page: {worksheet.requests_num / pages:.1f}")
+    print(f"Time: {total * 1000:.1f} ms")
+
+    # Same pages in the local sqlite sink
+    with tempfile.TemporaryDirectory() as temp_folder:
+        sqlite_sink = SqliteSink(os.path.join(temp_folder, "output.sqlite3"))
+        data_manager = DataManager([sqlite_sink])
+
+        start = perf_counter()
+        for page in range(pages):
+            data_manager.write_output_data(get_fake_page(page, rows_num))
+        total = perf_counter() - start
+
+        rows_num_db = len(sqlite_sink.get_rows(limit=pages * rows_num))
+        data_manager.close()
+
+    print(f"Rows in sqlite: {rows_num_db}")
+    print(f"Sqlite time: {total * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from queue import Queue
+from contextlib import contextmanager
+
+
+class AccountPool ():
+    """ Accounts (email and password) shared by the workers. Each account is
+    used by a single worker at a time, because the site keeps only one live
+    session for each account (a new login ends the other sessions) """
+
+    def __init__(self, accounts: list[tuple[str, str]]):
+        """ Save the accounts
+
+        Args:
+            accounts (list[tuple[str, str]]): email and password of each account
+        """
+
+        if not accounts:
+            raise ValueError("At least one account is required")
+
+        self.size = len(accounts)
+        self.dropped = set()
+        self.accounts = Queue()
+        for account in accounts:
+            self.accounts.put(account)
+
+    @contextmanager
+    def account(self):
+        """ Take a free account (waiting until one is released) and release it
+        at the end (if it is not dropped)
+
+        Yields:
+            tuple[str, str]: email and password of the account
+        """
+
+        account = self.accounts.get()
+        try:
+            yield account
+        finally:
+            if account[0] in self.dropped:
+                self.size -= 1
+            else:
+                self.accounts.put(account)
+
+    def drop(self, email: str):
+        """ Remove an account from the pool (it can not login), when it
+        is released
+
+        Args:
+            email (str): email of the account
+        """
+
+        self.dropped.add(email)
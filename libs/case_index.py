@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from libs.date_ranges import DATE_FORMAT
+
+
+class CaseIndex ():
+    """ Local index (sqlite) of the cases already exported, by case number
+    and case type, and of the filed date where the next incremental search
+    of each case type starts (watermark) """
+
+    def __init__(self, db_path: os.PathLike):
+        """ Open (or create) the index
+
+        Args:
+            db_path (os.PathLike): path of the sqlite file
+        """
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS cases (
+                number TEXT NOT NULL,
+                type TEXT NOT NULL,
+                PRIMARY KEY (number, type)
+            ) WITHOUT ROWID
+        """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS watermarks (
+                type TEXT PRIMARY KEY,
+                filed_date TEXT NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+        # Dates windows of the current run (done or not), by case types
+        self.windows = {}
+
+    def count(self) -> int:
+        """ Return the number of cases in the index """
+
+        with self.lock:
+            cursor = self.connection.execute("SELECT COUNT(*) FROM cases")
+            return cursor.fetchone()[0]
+
+    def add(self, cases: list[tuple[str, str]]):
+        """ Add cases to the index (duplicates are ignored)
+
+        Args:
+            cases (list[tuple[str, str]]): case number and case type of each case
+        """
+
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO cases (number, type) VALUES (?, ?)",
+                cases
+            )
+            self.connection.commit()
+
+    def contains(self, number: str, case_type: str) -> bool:
+        """ Check if a case is in the index
+
+        Args:
+            number (str): case number
+            case_type (str): case type
+
+        Returns:
+            bool: True if the case was already exported
+        """
+
+        with self.lock:
+            cursor = self.connection.execute(
+                "SELECT 1 FROM cases WHERE number = ? AND type = ?",
+                (number, case_type)
+            )
+            return cursor.fetchone() is not None
+
+    def filter_new(self, cases_data: list[dict]) -> list[dict]:
+        """ Return only the cases not in the index (and not repeated in the list)
+
+        Args:
+            cases_data (list[dict]): list of cases data (with number and type)
+
+        Returns:
+            list[dict]: cases not exported yet
+        """
+
+        new_cases = []
+        keys = set()
+        for case_data in cases_data:
+            key = (case_data["number"], case_data["type"])
+            if key in keys or self.contains(*key):
+                continue
+            keys.add(key)
+            new_cases.append(case_data)
+
+        return new_cases
+
+    def update_watermarks(self, cases: list[tuple[str, str]]):
+        """ Save the latest filed date of each case type (if newer than the saved one)
+        as its watermark
+
+        Args:
+            cases (list[tuple[str, str]]): case type and filed date
+                (format "mm/dd/yyyy") of each case
+        """
+
+        # Latest date of each type (iso format, to compare as text in sqlite)
+        latest_dates = {}
+        for case_type, filed_date in cases:
+            try:
+                date = datetime.strptime(filed_date, DATE_FORMAT).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+            latest_dates[case_type] = max(date, latest_dates.get(case_type, date))
+
+        with self.lock:
+            self.connection.executemany("""
+                INSERT INTO watermarks (type, filed_date) VALUES (?, ?)
+                ON CONFLICT (type) DO UPDATE SET filed_date = excluded.filed_date
+                WHERE excluded.filed_date > watermarks.filed_date
+            """, latest_dates.items())
+            self.connection.commit()
+
+    def add_window(self, case_types: list[str], start_date: str, end_date: str,
+                   done: bool = False):
+        """ Add a dates window searched in the current run, for the watermarks
+
+        Args:
+            case_types (list[str]): case types of the search
+            start_date (str): start date in format "mm/dd/yyyy"
+            end_date (str): end date in format "mm/dd/yyyy"
+            done (bool): True if all the pages of the window are written
+        """
+
+        with self.lock:
+            windows = self.windows.setdefault(tuple(case_types), {})
+            windows[(start_date, end_date)] = done
+
+        if done:
+            self.__advance_watermarks__(case_types)
+
+    def complete_window(self, case_types: list[str], start_date: str, end_date: str):
+        """ Save a dates window as done (all its pages written)
+
+        Args:
+            case_types (list[str]): case types of the search
+            start_date (str): start date in format "mm/dd/yyyy"
+            end_date (str): end date in format "mm/dd/yyyy"
+        """
+
+        self.add_window(case_types, start_date, end_date, done=True)
+
+    def __advance_watermarks__(self, case_types: list[str]):
+        """ Move the watermarks of the case types to the day after the windows
+        done in a row from the oldest one, so they never pass the start of a
+        window not done. Never after today (more cases can be filed today)
+
+        Args:
+            case_types (list[str]): case types of the search
+        """
+
+        with self.lock:
+            windows = self.windows.get(tuple(case_types), {})
+            windows_dates = sorted(
+                windows, key=lambda dates: datetime.strptime(dates[0], DATE_FORMAT)
+            )
+            last_end_date = None
+            for dates in windows_dates:
+                if not windows[dates]:
+                    break
+                last_end_date = dates[1]
+
+        if not last_end_date:
+            return
+
+        next_date = datetime.strptime(last_end_date, DATE_FORMAT) + timedelta(days=1)
+        next_date = min(next_date, datetime.now()).strftime(DATE_FORMAT)
+        self.update_watermarks([(case_type, next_date) for case_type in case_types])
+
+    def get_watermark(self, case_type: str) -> str:
+        """ Return the watermark of a case type: the cases filed before it
+        are exported
+
+        Args:
+            case_type (str): case type
+
+        Returns:
+            str: filed date in format "mm/dd/yyyy" (empty if there are no cases)
+        """
+
+        with self.lock:
+            cursor = self.connection.execute(
+                "SELECT filed_date FROM watermarks WHERE type = ?", (case_type,)
+            )
+            row = cursor.fetchone()
+
+        if not row:
+            return ""
+        return datetime.strptime(row[0], "%Y-%m-%d").strftime(DATE_FORMAT)
+
+    def close(self):
+        """ Close the sqlite connection """
+
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,133 @@
+import os
+import json
+import threading
+from datetime import datetime
+
+
+class CheckpointStore ():
+    """ Save the progress of each search (last page written) in a local json
+    file, to resume the runs after a crash """
+
+    # Checkpoint of a search not started
+    empty_checkpoint = {
+        "last_page": 0,
+        "pages": 0,
+        "rows_written": 0,
+        "done": False,
+    }
+
+    def __init__(self, file_path: os.PathLike):
+        """ Load the saved checkpoints (if the file exists)
+
+        Args:
+            file_path (os.PathLike): path of the json file
+        """
+
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self.checkpoints = {}
+
+        if os.path.exists(self.file_path):
+            with open(self.file_path) as file:
+                self.checkpoints = json.load(file)
+
+    @staticmethod
+    def get_key(start_date: str, end_date: str, case_types: list[str],
+                first_page: int = 1) -> str:
+        """ Return the key of a search (or of a range of its pages)
+
+        Args:
+            start_date (str): start date in format "mm/dd/yyyy"
+            end_date (str): end date in format "mm/dd/yyyy"
+            case_types (list[str]): case types of the search
+            first_page (int): first page of the range
+
+        Returns:
+            str: search key
+        """
+
+        key = f"{start_date}|{end_date}|{','.join(case_types)}"
+        if first_page > 1:
+            key += f"|{first_page}"
+        return key
+
+    def __save__(self):
+        """ Write the checkpoints in the file (replacing it atomically) """
+
+        temp_path = f"{self.file_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.checkpoints, file, indent=4)
+        os.replace(temp_path, self.file_path)
+
+    def get(self, key: str) -> dict:
+        """ Return the checkpoint of a search
+
+        Args:
+            key (str): search key (from 'get_key')
+
+        Returns:
+            dict: checkpoint data
+                last_page (int): last page written (0 if none)
+                pages (int): total pages of the search (0 if unknown)
+                rows_written (int): rows written in the output
+                done (bool): True if all the pages were written
+        """
+
+        with self.lock:
+            checkpoint = self.checkpoints.get(key)
+            if checkpoint:
+                return dict(checkpoint)
+
+        return dict(self.empty_checkpoint)
+
+    def __update__(self, key: str, **values):
+        """ Update and save the values of a checkpoint
+
+        Args:
+            key (str): search key
+            **values: checkpoint values to update
+        """
+
+        with self.lock:
+            checkpoint = self.checkpoints.setdefault(key, dict(self.empty_checkpoint))
+            checkpoint.update(values)
+            checkpoint["updated"] = datetime.now().isoformat()
+            self.__save__()
+
+    def save_page(self, key: str, page: int, rows_written: int):
+        """ Save a page as written
+
+        Args:
+            key (str): search key
+            page (int): page number
+            rows_written (int): rows of the page written in the output
+        """
+
+        rows_written += self.get(key)["rows_written"]
+        self.__update__(key, last_page=page, rows_written=rows_written)
+
+    def save_pages(self, key: str, pages: int):
+        """ Save the total pages of a search
+
+        Args:
+            key (str): search key
+            pages (int): total pages
+        """
+
+        self.__update__(key, pages=pages)
+
+    def save_done(self, key: str):
+        """ Save a search as completed
+
+        Args:
+            key (str): search key
+        """
+
+        self.__update__(key, done=True)
+
+    def clear(self):
+        """ Delete all the checkpoints """
+
+        with self.lock:
+            self.checkpoints = {}
+            self.__save__()
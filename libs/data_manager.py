@@ -1,30 +1,60 @@
 import os
-from libs.google_sheets import SheetsManager
+from libs.output_sinks import OutputSink
+from libs.case_index import CaseIndex
+from libs.decorators import track_time
+from libs.metrics import metrics
 
 
-class DataManager(SheetsManager):
+class DataManager():
 
-    def __init__(self, google_sheet_link: str, creds_path: os.PathLike,
-                 sheet_output: str):
-        """ Class to manage data from google sheet
+    def __init__(self, sinks: list[OutputSink], index_path: os.PathLike = None):
+        """ Class to manage the output data, saved in one or more sinks
 
         Args:
-            google_sheet_link (str): editable google sheet link
-            creds_path (os.PathLike): path to google json credentials file
-            sheet_output (str): name of the output sheet
+            sinks (list[OutputSink]): sinks where the rows are saved
+                (like SheetsSink or SqliteSink). The first one is used
+                to load the exported cases
+            index_path (os.PathLike): path of the local index of exported cases.
+                If given, only the cases not exported yet are written
         """
 
-        # Connect to google sheet
-        super().__init__(google_sheet_link, creds_path)
-        
-        # Save output sheet name
-        self.sheet_output = sheet_output
+        if not sinks:
+            raise ValueError("At least one output sink is required")
+
+        self.sinks = sinks
+
+        # Cases written but still buffered by a sink (indexed after the flush)
+        self.pending_cases = []
+
+        # Index of exported cases
+        self.case_index = None
+        if index_path:
+            self.case_index = CaseIndex(index_path)
+            if not self.case_index.count():
+                self.__seed_case_index__()
+
+    def __seed_case_index__(self):
+        """ Add to the index the cases in the first sink (single read).
+        The watermarks are not seeded: the rows can be from a partial run
+        (with gaps), so the first incremental run starts in START_DATE """
+
+        print("\tLoading exported cases in local index...")
 
-        # Move to output sheet
-        self.set_sheet(self.sheet_output)
+        # Read number and type columns (without the header)
+        sink = self.sinks[0]
+        numbers, types = sink.get_columns_values([2, 4])
+        numbers = numbers[sink.header_rows:]
+        types = types[sink.header_rows:]
+        types += [""] * (len(numbers) - len(types))
+        cases = [
+            (number, case_type) for number, case_type in zip(numbers, types)
+            if number
+        ]
+        self.case_index.add(cases)
 
-    def write_output_data(self, cases_data: list[dict]):
-        """ Write case row in output sheet
+    @track_time("write_output")
+    def write_output_data(self, cases_data: list[dict], metadata: dict = None) -> int:
+        """ Write case rows in the output sinks
 
         Args:
             list[dict]: list of cases data
@@ -33,9 +63,21 @@ class DataManager(SheetsManager):
                 location (str): case location
                 type (str): case type
                 filed_date (str): case filed date
+            metadata (dict): data of the batch, like page number and shard
+
+        Returns:
+            int: number of rows written
         """
         
-        print("\tWriting data in output sheet...")
+        print("\tWriting data in output...")
+
+        # Skip cases already exported (or buffered)
+        if self.case_index:
+            pending_keys = set(self.pending_cases)
+            cases_data = [
+                case_data for case_data in self.case_index.filter_new(cases_data)
+                if (case_data["number"], case_data["type"]) not in pending_keys
+            ]
 
         rows = []
         for case_data in cases_data:
@@ -45,15 +87,51 @@ class DataManager(SheetsManager):
                 continue
             
             # Format row
-            row = [
-                case_data["description"],
-                case_data["number"],
-                case_data["location"],
-                case_data["type"],
-                case_data["filed_date"],
-            ]
+            row = [case_data[column] for column in OutputSink.columns]
             rows.append(row)
 
-        # Write row in output sheet
-        last_row = self.get_rows_num()
-        self.write_data(rows, row=last_row + 1)
+        # Write rows in each sink
+        for sink in self.sinks:
+            sink.write_rows(rows, metadata)
+
+        # Save cases in the index, once all the sinks saved them
+        # (the watermarks move when each search is done)
+        if self.case_index:
+            self.pending_cases += [(row[1], row[3]) for row in rows]
+            self.__index_pending_cases__()
+
+        metrics.add_count("rows_written", len(rows))
+        return len(rows)
+
+    def __index_pending_cases__(self):
+        """ Add the written cases to the index, if no sink has rows buffered
+        (a crash before the flush must not skip them in the next run) """
+
+        if not self.case_index or not self.pending_cases or self.has_pending_rows():
+            return
+
+        self.case_index.add(self.pending_cases)
+        self.pending_cases = []
+
+    def has_pending_rows(self) -> bool:
+        """ Return True if a sink has rows buffered (not saved yet) """
+
+        return any(sink.has_pending_rows() for sink in self.sinks)
+
+    def flush(self):
+        """ Save the rows buffered by the sinks """
+
+        for sink in self.sinks:
+            sink.flush()
+
+        self.__index_pending_cases__()
+
+    def close(self):
+        """ Close the sinks and the index """
+
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+        if self.case_index:
+            self.case_index.close()
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+DATE_FORMAT = "%m/%d/%Y"
+
+
+def split_date_range(start_date: str, end_date: str, size: str = "") -> list[tuple[str, str]]:
+    """ Split a date range in consecutive windows
+
+    Args:
+        start_date (str): start date in format "mm/dd/yyyy"
+        end_date (str): end date in format "mm/dd/yyyy"
+        size (str): size of each window: "week", "month" or a number of days.
+            Empty to use a single window
+
+    Returns:
+        list[tuple[str, str]]: start and end date of each window
+            (in format "mm/dd/yyyy", both included)
+
+    Raises:
+        ValueError: if the size is not "week", "month" or a positive number
+    """
+
+    start = datetime.strptime(start_date, DATE_FORMAT)
+    end = datetime.strptime(end_date, DATE_FORMAT)
+
+    size = size.strip().lower()
+    if not size:
+        return [(start_date, end_date)]
+
+    if size not in ("week", "month") and not (size.isdigit() and int(size) > 0):
+        raise ValueError(
+            f"Invalid shard size: '{size}' (use week, month or a number of days)"
+        )
+
+    windows = []
+    window_start = start
+    while window_start <= end:
+
+        # Calculate last day of the window
+        if size == "month":
+            next_month = (window_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+            window_end = next_month - timedelta(days=1)
+        elif size == "week":
+            window_end = window_start + timedelta(days=6)
+        else:
+            window_end = window_start + timedelta(days=int(size) - 1)
+        window_end = min(window_end, end)
+
+        windows.append((
+            window_start.strftime(DATE_FORMAT),
+            window_end.strftime(DATE_FORMAT)
+        ))
+        window_start = window_end + timedelta(days=1)
+
+    return windows
@@ -1,9 +1,55 @@
+from functools import wraps
+from time import perf_counter
+
+from libs.metrics import metrics
+
+
 def save_screnshot(func):
+    """ Register each call in the diagnostics of the browser, and save them
+    to disk only when the call fails (raises an error or times out) """
+
     def wrapper(self, *args, **kwargs):
-        # Take a screenshot of current chrome window
-        self.screenshot("screenshot.png")
+        # Save a lightweight snapshot of current chrome window
+        snapshot = self.add_snapshot(func.__name__)
+        start = perf_counter()
+
+        try:
+            result = func(self, *args, **kwargs)
+        except Exception as error:
+            snapshot["duration"] = perf_counter() - start
+            snapshot["error"] = repr(error)
 
-        result = func(self, *args, **kwargs)
+            # Save diagnostics once (in the inner failed step)
+            if not getattr(error, "diagnostics_folder", None):
+                folder = self.save_diagnostics(func.__name__, error)
+                error.diagnostics_folder = folder
+                print(f"\tERROR in '{func.__name__}'. Diagnostics saved in: {folder}")
+            raise
 
+        snapshot["duration"] = perf_counter() - start
         return result
     return wrapper
+
+
+def track_time(phase: str):
+    """ Register the duration (and errors) of each call in the run metrics
+
+    Args:
+        phase (str): phase name in the metrics
+    """
+
+    def decorator(func):
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                metrics.add_duration(phase, perf_counter() - start, error=True)
+                raise
+
+            metrics.add_duration(phase, perf_counter() - start)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import threading
+from time import perf_counter
+
+import selenium
+
+
+class DriverProfiler ():
+    """ Count and time each webdriver command (round trip to chrome), with
+    the scraper method that sent it, to find the slowest steps """
+
+    # Files skipped to find the caller of a command (selenium and helpers)
+    skipped_folders = (
+        os.path.dirname(os.path.abspath(selenium.__file__)),
+    )
+    skipped_files = (
+        os.path.abspath(__file__),
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "web_scraping.py"),
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "decorators.py"),
+    )
+
+    def __init__(self):
+        """ Start an empty profile (call 'attach' with each new driver) """
+
+        self.lock = threading.Lock()
+
+        # Count and seconds by caller and command
+        self.hot_spots = {}
+
+        # Commands of the current page, and summary of the finished pages
+        self.page_commands = {}
+        self.page_seconds = 0.0
+        self.pages = []
+
+    def attach(self, driver):
+        """ Wrap the 'execute' method of a driver, to register its commands
+        (all the driver and element commands use it)
+
+        Args:
+            driver (webdriver.Chrome): driver to profile
+        """
+
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            start = perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                # Never replace the result (or error) of the command
+                try:
+                    duration = perf_counter() - start
+                    self.add_command(driver_command, self.__get_caller__(), duration)
+                except Exception as error:
+                    print(f"\tError profiling the command {driver_command}: {error}")
+
+        driver.execute = execute
+
+    def __get_caller__(self) -> str:
+        """ Return the first method in the stack outside selenium and the
+        web scraping helpers (like 'Scraper.get_current_cases_data') """
+
+        frame = sys._getframe(2)
+        while frame:
+            file_path = os.path.abspath(frame.f_code.co_filename)
+            if not (file_path.startswith(self.skipped_folders)
+                    or file_path in self.skipped_files):
+                # Qualified name (class and method) only in python 3.11+
+                return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            frame = frame.f_back
+
+        return "unknown"
+
+    def add_command(self, command: str, caller: str, duration: float):
+        """ Register a command
+
+        Args:
+            command (str): webdriver command name (like "findElement")
+            caller (str): method that sent the command
+            duration (float): seconds of the round trip
+        """
+
+        with self.lock:
+            hot_spot = self.hot_spots.setdefault((caller, command), [0, 0.0])
+            hot_spot[0] += 1
+            hot_spot[1] += duration
+
+            self.page_commands[command] = self.page_commands.get(command, 0) + 1
+            self.page_seconds += duration
+
+    def end_page(self, page: int):
+        """ Save the summary of the commands sent since the last page
+
+        Args:
+            page (int): number of the page scraped
+        """
+
+        with self.lock:
+            self.pages.append({
+                "page": page,
+                "commands": sum(self.page_commands.values()),
+                "seconds": self.page_seconds,
+                "by_command": dict(self.page_commands),
+            })
+            self.page_commands = {}
+            self.page_seconds = 0.0
+
+    def get_report(self, top: int = 20) -> dict:
+        """ Return the commands summary
+
+        Args:
+            top (int): number of hot spots to include
+
+        Returns:
+            dict: report data
+                commands (int): total commands
+                seconds (float): total seconds in commands
+                commands_per_page (float): average commands by page
+                hot_spots (list[dict]): caller, command, count, seconds and
+                    avg_ms, sorted by seconds (slowest first)
+                pages (list[dict]): page, commands, seconds and by_command
+                    of each page
+        """
+
+        with self.lock:
+            hot_spots = [
+                {
+                    "caller": caller,
+                    "command": command,
+                    "count": count,
+                    "seconds": seconds,
+                    "avg_ms": seconds / count * 1000,
+                }
+                for (caller, command), (count, seconds) in self.hot_spots.items()
+            ]
+            pages = list(self.pages)
+
+        hot_spots.sort(key=lambda hot_spot: hot_spot["seconds"], reverse=True)
+        commands = sum(hot_spot["count"] for hot_spot in hot_spots)
+        page_commands = sum(page["commands"] for page in pages)
+        return {
+            "commands": commands,
+            "seconds": sum(hot_spot["seconds"] for hot_spot in hot_spots),
+            "commands_per_page": page_commands / len(pages) if pages else 0,
+            "hot_spots": hot_spots[:top],
+            "pages": pages,
+        }
+
+    def get_hot_spots_text(self, top: int = 20) -> str:
+        """ Return the hot spots report as a text table
+
+        Args:
+            top (int): number of hot spots to include
+
+        Returns:
+            str: report text
+        """
+
+        report = self.get_report(top)
+        lines = [
+            f"Commands: {report['commands']} ({report['seconds']:.2f} s), "
+            f"per page: {report['commands_per_page']:.1f}",
+            f"{'seconds':>9} {'count':>7} {'avg ms':>8}  caller / command",
+        ]
+        for hot_spot in report["hot_spots"]:
+            lines.append(
+                f"{hot_spot['seconds']:>9.2f} {hot_spot['count']:>7} "
+                f"{hot_spot['avg_ms']:>8.1f}  {hot_spot['caller']} / {hot_spot['command']}"
+            )
+
+        return "\n".join(lines)
+
+    def save_report(self, file_path: os.PathLike, top: int = 50):
+        """ Save the report in a json file
+
+        Args:
+            file_path (os.PathLike): path of the json file
+            top (int): number of hot spots to include
+        """
+
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        with open(file_path, "w") as file:
+            json.dump(self.get_report(top), file, indent=4)
@@ -8,21 +8,36 @@ from oauth2client.service_account import ServiceAccountCredentials
 class SheetsManager ():
     """ Class to conect to google shets and upload data"""
 
-    def __init__(self, google_sheet_link, creds_path, sheet_name=None):
-        """ Construtor of the class"""
+    # Max rows sent in each write request (keeps payloads under the api limits)
+    max_rows_per_request = 1000
 
-        # Read credentials
-        if not os.path.isfile(creds_path):
-            raise FileNotFoundError("The credential file path is not correct")
+    def __init__(self, google_sheet_link, creds_path, sheet_name=None, sheet=None):
+        """ Construtor of the class
 
-        scope = ['https://spreadsheets.google.com/feeds',
-                 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(
-            creds_path, scope)
-        client = gspread.authorize(creds)
+        Args:
+            google_sheet_link (str): editable google sheet link
+            creds_path (os.PathLike): path to google json credentials file
+            sheet_name (str): name of the worksheet to use
+            sheet (gspread.Spreadsheet): already opened spreadsheet
+                (or a local fake of it). If given, the credentials are not used
+        """
+
+        if sheet is None:
+
+            # Read credentials
+            if not os.path.isfile(creds_path):
+                raise FileNotFoundError("The credential file path is not correct")
 
-        # Conect to google sheet
-        self.sheet = client.open_by_url(google_sheet_link)
+            scope = ['https://spreadsheets.google.com/feeds',
+                     'https://www.googleapis.com/auth/drive']
+            creds = ServiceAccountCredentials.from_json_keyfile_name(
+                creds_path, scope)
+            client = gspread.authorize(creds)
+
+            # Conect to google sheet
+            sheet = client.open_by_url(google_sheet_link)
+
+        self.sheet = sheet
 
         # Set the sheet 1 as worksheet
         if sheet_name:
@@ -53,23 +68,50 @@ class SheetsManager ():
                 break
 
     def write_data(self, data, row=1, column=1):
-        """ Write list of data in the worksheet"""
+        """ Write list of data in the worksheet, with a single request
+        for each block of 'max_rows_per_request' rows
+
+        Args:
+            data (list[list]): rows of data to write
+            row (int): first row number
+            column (int): first column number
+        """
 
         # check if data exist
         if not data:
             print("THERE IS NO NEW INFORMATION TO WRITE IN THE FILE.")
-        else:
-            
-            # Loop for each row of data
-            row_index = row
-            for row_data in data:
-                
-                # Write the row in the sheet
-                cell_range = self.get_range(row_index, column, len(row_data))
-                self.worksheet.update(cell_range, [row_data])
-                
-                # Update row index
-                row_index += 1
+            return
+
+        # Loop for each block of rows
+        for start in range(0, len(data), self.max_rows_per_request):
+            block = data[start:start + self.max_rows_per_request]
+
+            # Write the block in the sheet
+            start_row = row + start
+            end_col = column + max(len(row_data) for row_data in block) - 1
+            cell_range = self.get_range(
+                start_row, column, end_col, start_row + len(block) - 1)
+            self.__update_range__(cell_range, block)
+
+    def __update_range__(self, cell_range: str, data: list, retries: int = 3):
+        """ Write a block of data in a range, retrying on api errors
+
+        Args:
+            cell_range (str): range of the cells (like "A1:E10")
+            data (list[list]): rows of data to write
+            retries (int): number of attempts
+        """
+
+        for attempt in range(retries):
+            try:
+                self.worksheet.update(cell_range, data)
+            except Exception:
+                if attempt == retries - 1:
+                    raise
+                print("\tError writing data. Retrying in 1 minute...")
+                sleep(60)
+            else:
+                break
 
     def get_data(self):
         """ Read all records of the sheet"""
@@ -77,6 +119,26 @@ class SheetsManager ():
         records = self.worksheet.get_all_records()
         return records
 
+    def get_columns_values(self, columns: list[int]) -> list[list]:
+        """ Read the values of several columns, with a single request
+
+        Args:
+            columns (list[int]): columns numbers
+
+        Returns:
+            list[list]: values of each column (empty strings for empty cells)
+        """
+
+        ranges = []
+        for column in columns:
+            column_letter = gspread.utils.rowcol_to_a1(1, column).rstrip("0123456789")
+            ranges.append(f"{column_letter}:{column_letter}")
+
+        columns_values = []
+        for value_range in self.worksheet.batch_get(ranges):
+            columns_values.append([row[0] if row else "" for row in value_range])
+        return columns_values
+
     def get_rows_num(self) -> int:
         """ Get number of the rows in use """
 
@@ -92,18 +154,22 @@ class SheetsManager ():
 
         self.worksheet.delete_row(row)
 
-    def get_range(self, row, start_col, end_col) -> str:
+    def get_range(self, row, start_col, end_col, end_row=None) -> str:
         """ Return the range of the cells
         
         Args:
-            row (int): row number
+            row (int): row number (first row of the range)
             start_col (int): start column number
             end_col (int): end column number
+            end_row (int): last row of the range. Defaults to 'row'
             
         Returns:
             str: range of the cells
         """
         
+        if end_row is None:
+            end_row = row
+
         start_cell = gspread.utils.rowcol_to_a1(row, start_col)
-        end_cell = gspread.utils.rowcol_to_a1(row, end_col)
+        end_cell = gspread.utils.rowcol_to_a1(end_row, end_col)
         return f"{start_cell}:{end_cell}"
\ No newline at end of file
@@ -0,0 +1,189 @@
+import os
+import json
+import threading
+from time import time
+
+
+class Metrics ():
+    """ Durations, calls and errors of the phases of a run (like login or
+    page extraction) and counters (like pages and rows) """
+
+    # Prefix of the prometheus metrics
+    prefix = "txcourts_bot"
+
+    def __init__(self):
+        """ Start an empty run """
+
+        self.lock = threading.Lock()
+        self.start_time = time()
+        self.phases = {}
+        self.counters = {}
+
+    def add_duration(self, phase: str, duration: float, error: bool = False):
+        """ Register a call of a phase
+
+        Args:
+            phase (str): phase name
+            duration (float): seconds of the call
+            error (bool): True if the call raised an error
+        """
+
+        with self.lock:
+            phase_data = self.phases.setdefault(phase, {
+                "calls": 0,
+                "errors": 0,
+                "seconds": 0.0,
+                "min_seconds": duration,
+                "max_seconds": duration,
+            })
+            phase_data["calls"] += 1
+            phase_data["errors"] += int(error)
+            phase_data["seconds"] += duration
+            phase_data["min_seconds"] = min(phase_data["min_seconds"], duration)
+            phase_data["max_seconds"] = max(phase_data["max_seconds"], duration)
+
+    def add_count(self, name: str, value: int = 1):
+        """ Increase a counter
+
+        Args:
+            name (str): counter name (like "pages_scraped")
+            value (int): value to add
+        """
+
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def get_report(self) -> dict:
+        """ Return the metrics of the run
+
+        Returns:
+            dict: report data
+                run_seconds (float): seconds since the start of the run
+                pages_per_minute (float): pages scraped by minute
+                rows_per_page (float): average rows scraped by page
+                counters (dict): value of each counter
+                phases (dict): calls, errors, seconds, min_seconds, max_seconds
+                    and avg_seconds of each phase
+        """
+
+        with self.lock:
+            run_seconds = time() - self.start_time
+            counters = dict(self.counters)
+            phases = {}
+            for phase, phase_data in self.phases.items():
+                phases[phase] = dict(phase_data)
+                phases[phase]["avg_seconds"] = phase_data["seconds"] / phase_data["calls"]
+
+        pages = counters.get("pages_scraped", 0)
+        return {
+            "run_seconds": run_seconds,
+            "pages_per_minute": pages / run_seconds * 60 if run_seconds else 0,
+            "rows_per_page": counters.get("rows_scraped", 0) / pages if pages else 0,
+            "counters": counters,
+            "phases": phases,
+        }
+
+    def get_prometheus_text(self) -> str:
+        """ Return the metrics in prometheus text format (textfile collector)
+
+        Returns:
+            str: metrics text
+        """
+
+        report = self.get_report()
+        lines = []
+
+        def add_metric(name: str, metric_type: str, description: str, values: list):
+            lines.append(f"# HELP {self.prefix}_{name} {description}")
+            lines.append(f"# TYPE {self.prefix}_{name} {metric_type}")
+            for labels, value in values:
+                lines.append(f"{self.prefix}_{name}{labels} {value}")
+
+        add_metric("run_start_timestamp_seconds", "gauge", "Start time of the run",
+                   [("", self.start_time)])
+        add_metric("run_seconds", "gauge", "Duration of the run",
+                   [("", report["run_seconds"])])
+        add_metric("pages_per_minute", "gauge", "Pages scraped by minute",
+                   [("", report["pages_per_minute"])])
+        add_metric("rows_per_page", "gauge", "Average rows scraped by page",
+                   [("", report["rows_per_page"])])
+
+        for name, value in sorted(report["counters"].items()):
+            add_metric(f"{name}_total", "counter", f"Total {name.replace('_', ' ')}",
+                       [("", value)])
+
+        phases = sorted(report["phases"].items())
+        for key, metric_type, description in (
+            ("calls", "counter", "Calls of each phase"),
+            ("errors", "counter", "Errors of each phase"),
+            ("seconds", "counter", "Total seconds of each phase"),
+            ("max_seconds", "gauge", "Slowest call of each phase"),
+        ):
+            name = f"phase_{key}_total" if metric_type == "counter" else f"phase_{key}"
+            add_metric(name, metric_type, description, [
+                (f'{{phase="{phase}"}}', phase_data[key])
+                for phase, phase_data in phases
+            ])
+
+        return "\n".join(lines) + "\n"
+
+    def save(self, json_path: os.PathLike, prometheus_path: os.PathLike):
+        """ Write the json report and the prometheus file (replacing them atomically)
+
+        Args:
+            json_path (os.PathLike): path of the json report
+            prometheus_path (os.PathLike): path of the prometheus file (.prom)
+        """
+
+        files_data = (
+            (json_path, json.dumps(self.get_report(), indent=4)),
+            (prometheus_path, self.get_prometheus_text()),
+        )
+        for file_path, file_data in files_data:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            temp_path = f"{file_path}.tmp"
+            with open(temp_path, "w") as file:
+                file.write(file_data)
+            os.replace(temp_path, file_path)
+
+
+class MetricsReporter(threading.Thread):
+    """ Background thread that saves the metrics periodically """
+
+    def __init__(self, metrics: Metrics, json_path: os.PathLike,
+                 prometheus_path: os.PathLike, interval: int = 60):
+        """ Initialize the reporter (call 'start' to run it)
+
+        Args:
+            metrics (Metrics): metrics of the run
+            json_path (os.PathLike): path of the json report
+            prometheus_path (os.PathLike): path of the prometheus file
+            interval (int): seconds between reports
+        """
+
+        super().__init__(name="metrics-reporter", daemon=True)
+
+        self.metrics = metrics
+        self.json_path = json_path
+        self.prometheus_path = prometheus_path
+        self.interval = interval
+        self.stop_event = threading.Event()
+
+    def run(self):
+        """ Save the metrics each 'interval' seconds, until 'close' """
+
+        while not self.stop_event.wait(self.interval):
+            self.metrics.save(self.json_path, self.prometheus_path)
+
+    def close(self):
+        """ Stop the reporter and save the final metrics """
+
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+
+        self.metrics.save(self.json_path, self.prometheus_path)
+
+
+# Metrics of the current run
+metrics = Metrics()
@@ -0,0 +1,366 @@
+import os
+import gzip
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from libs.google_sheets import SheetsManager
+
+
+class OutputSink ():
+    """ Destination of the output rows (base class of the sinks) """
+
+    # Name of the sink (used to save its sync progress)
+    name = ""
+
+    # Columns of the output rows
+    columns = ["description", "number", "location", "type", "filed_date"]
+
+    # Rows before the data (like the header of a sheet)
+    header_rows = 0
+
+    def write_rows(self, rows: list[list], metadata: dict = None):
+        """ Save output rows
+
+        Args:
+            rows (list[list]): rows of data, with the values of 'columns'
+            metadata (dict): data of the batch, like page number and shard
+                (optional, not saved by all the sinks)
+        """
+
+        raise NotImplementedError
+
+    def get_columns_values(self, columns: list[int]) -> list[list]:
+        """ Read the values of several columns
+
+        Args:
+            columns (list[int]): columns numbers (starting in 1)
+
+        Returns:
+            list[list]: values of each column
+        """
+
+        raise NotImplementedError
+
+    def has_pending_rows(self) -> bool:
+        """ Return True if there are rows buffered (not saved yet) """
+
+        return False
+
+    def flush(self):
+        """ Save the buffered rows (if any) """
+
+    def close(self):
+        """ Release the resources of the sink """
+
+
+class SheetsSink(SheetsManager, OutputSink):
+    """ Save the output rows in a google sheet """
+
+    name = "sheets"
+    header_rows = 1
+
+    def __init__(self, google_sheet_link: str, creds_path: os.PathLike,
+                 sheet_output: str, sheet=None):
+        """ Connect to the output sheet
+
+        Args:
+            google_sheet_link (str): editable google sheet link
+            creds_path (os.PathLike): path to google json credentials file
+            sheet_output (str): name of the output sheet
+            sheet (gspread.Spreadsheet): already opened spreadsheet (optional)
+        """
+
+        super().__init__(google_sheet_link, creds_path, sheet_name=sheet_output,
+                         sheet=sheet)
+
+        # Next free row in the output sheet (read once, then tracked locally)
+        self.next_row = 1
+        self.__sync_next_row__()
+
+    def __sync_next_row__(self):
+        """ Read the next free row from the output sheet """
+
+        self.next_row = self.get_rows_num() + 1
+
+    def write_rows(self, rows: list[list], metadata: dict = None):
+        """ Write rows after the last row of the sheet (single request) """
+
+        try:
+            self.write_data(rows, row=self.next_row)
+        except Exception:
+            # Resync the row cursor, so the next writes start after the real data
+            # (its own error, like the api down, does not hide the write error)
+            try:
+                self.__sync_next_row__()
+            except Exception as sync_error:
+                print(f"\tError reading the next row of the sheet: {sync_error}")
+            raise
+
+        self.next_row += len(rows)
+
+
+class SqliteSink(OutputSink):
+    """ Save the output rows in a local sqlite database """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: os.PathLike):
+        """ Open (or create) the database
+
+        Args:
+            db_path (os.PathLike): path of the sqlite file
+        """
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS cases (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                description TEXT,
+                number TEXT,
+                location TEXT,
+                type TEXT,
+                filed_date TEXT,
+                created TEXT
+            )
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS cases_number ON cases (number)"
+        )
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS syncs (
+                target TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+    def write_rows(self, rows: list[list], metadata: dict = None):
+        """ Insert rows (single transaction) """
+
+        if not rows:
+            return
+
+        created = datetime.now().isoformat()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                f"INSERT INTO cases ({', '.join(self.columns)}, created) "
+                f"VALUES ({', '.join('?' * len(self.columns))}, ?)",
+                [list(row) + [created] for row in rows]
+            )
+
+    def get_columns_values(self, columns: list[int]) -> list[list]:
+        """ Read the values of several columns (single query) """
+
+        names = [self.columns[column - 1] for column in columns]
+        with self.lock:
+            cursor = self.connection.execute(
+                f"SELECT {', '.join(names)} FROM cases ORDER BY id"
+            )
+            rows = cursor.fetchall()
+
+        return [
+            ["" if value is None else value for value in column_values]
+            for column_values in zip(*rows)
+        ] or [[] for _ in columns]
+
+    def get_rows(self, after_id: int = 0, limit: int = 1000) -> list[tuple[int, list]]:
+        """ Read rows in insertion order
+
+        Args:
+            after_id (int): read only the rows after this id
+            limit (int): max rows to read
+
+        Returns:
+            list[tuple[int, list]]: id and values of each row
+        """
+
+        with self.lock:
+            cursor = self.connection.execute(
+                f"SELECT id, {', '.join(self.columns)} FROM cases "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, limit)
+            )
+            return [(row[0], list(row[1:])) for row in cursor.fetchall()]
+
+    def sync_to(self, sink: OutputSink, batch_size: int = 1000) -> int:
+        """ Copy to other sink the rows not copied in previous syncs
+
+        Args:
+            sink (OutputSink): target sink (like SheetsSink)
+            batch_size (int): rows written in each request to the target
+
+        Returns:
+            int: number of rows copied
+        """
+
+        with self.lock:
+            cursor = self.connection.execute(
+                "SELECT last_id FROM syncs WHERE target = ?", (sink.name,)
+            )
+            row = cursor.fetchone()
+        last_id = row[0] if row else 0
+
+        rows_synced = 0
+        while True:
+            rows = self.get_rows(last_id, batch_size)
+            if not rows:
+                break
+
+            sink.write_rows([values for _, values in rows])
+            rows_synced += len(rows)
+
+            # Save progress after each batch (to continue after an error)
+            last_id = rows[-1][0]
+            with self.lock, self.connection:
+                self.connection.execute("""
+                    INSERT INTO syncs (target, last_id) VALUES (?, ?)
+                    ON CONFLICT (target) DO UPDATE SET last_id = excluded.last_id
+                """, (sink.name, last_id))
+
+        return rows_synced
+
+    def close(self):
+        """ Close the sqlite connection """
+
+        with self.lock:
+            self.connection.close()
+
+
+class ArchiveSink(OutputSink):
+    """ Append the output rows to a compressed jsonl file (gzip), one case by
+    line with the page, shard and time of its batch """
+
+    name = "archive"
+
+    def __init__(self, file_path: os.PathLike, flush_rows: int = 0):
+        """ Open the archive (new rows are added at the end)
+
+        Args:
+            file_path (os.PathLike): path of the .jsonl.gz file
+            flush_rows (int): rows buffered before writing them to disk.
+                0 writes each batch. The checkpoints of the buffered pages
+                are saved after the rows are written (see OutputWriter)
+        """
+
+        self.file_path = file_path
+        self.flush_rows = flush_rows
+        self.lock = threading.Lock()
+        self.buffer = []
+
+    def write_rows(self, rows: list[list], metadata: dict = None):
+        """ Buffer the rows, and write them when the buffer is full """
+
+        if not rows:
+            return
+
+        # Case data and metadata of the batch in each line
+        batch_data = dict(metadata or {})
+        batch_data["timestamp"] = datetime.now().isoformat()
+        with self.lock:
+            for row in rows:
+                line_data = dict(batch_data)
+                line_data.update(zip(self.columns, row))
+                self.buffer.append(json.dumps(line_data) + "\n")
+
+            if len(self.buffer) >= self.flush_rows:
+                self.__flush__()
+
+    def __flush__(self):
+        """ Write the buffered lines as a new gzip member, and sync it to disk.
+        If the process crashes while writing, only that member is lost """
+
+        if not self.buffer:
+            return
+
+        data = gzip.compress("".join(self.buffer).encode("utf-8"))
+        with open(self.file_path, "ab") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+        self.buffer = []
+
+    def has_pending_rows(self) -> bool:
+        """ Return True if there are rows buffered (not written yet) """
+
+        with self.lock:
+            return bool(self.buffer)
+
+    def flush(self):
+        """ Write the buffered rows """
+
+        with self.lock:
+            self.__flush__()
+
+    @staticmethod
+    def read(file_path: os.PathLike):
+        """ Iterate the cases of an archive, reading it lazily
+        (stops at the end of the last complete line, if the file was truncated)
+
+        Args:
+            file_path (os.PathLike): path of the .jsonl.gz file
+
+        Yields:
+            dict: case data and metadata (page, shard, timestamp)
+        """
+
+        with gzip.open(file_path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    if not line.endswith("\n"):
+                        break
+                    yield json.loads(line)
+            except (EOFError, gzip.BadGzipFile):
+                print(f"\tThe archive {file_path} is truncated. Skipping the end.")
+
+    def get_columns_values(self, columns: list[int]) -> list[list]:
+        """ Read the values of several columns (single pass over the archive) """
+
+        names = [self.columns[column - 1] for column in columns]
+        columns_values = [[] for _ in columns]
+
+        self.flush()
+        if not os.path.exists(self.file_path):
+            return columns_values
+
+        for line_data in self.read(self.file_path):
+            for values, name in zip(columns_values, names):
+                values.append(line_data.get(name, ""))
+        return columns_values
+
+    def copy_to(self, sink: OutputSink, batch_size: int = 1000) -> int:
+        """ Write all the archived rows in other sink (like SheetsSink)
+
+        Args:
+            sink (OutputSink): target sink
+            batch_size (int): rows written in each request to the target
+
+        Returns:
+            int: number of rows copied
+        """
+
+        self.flush()
+
+        rows_copied = 0
+        rows = []
+        for line_data in self.read(self.file_path):
+            rows.append([line_data.get(column, "") for column in self.columns])
+            if len(rows) >= batch_size:
+                sink.write_rows(rows)
+                rows_copied += len(rows)
+                rows = []
+
+        if rows:
+            sink.write_rows(rows)
+            rows_copied += len(rows)
+
+        return rows_copied
+
+    def close(self):
+        """ Write the buffered rows """
+
+        self.flush()
@@ -0,0 +1,106 @@
+import threading
+from queue import Queue
+
+from libs.data_manager import DataManager
+
+
+class OutputWriter(threading.Thread):
+    """ Background thread that writes the scraped cases data, so the browser
+    can keep scraping while the output is being saved """
+
+    def __init__(self, data_manager: DataManager, max_batches: int = 5):
+        """ Initialize the writer (call 'start' to run it)
+
+        Args:
+            data_manager (DataManager): data manager used to write the data
+            max_batches (int): max pending batches. When the queue is full,
+                'put' blocks until the writer catches up
+        """
+
+        super().__init__(name="output-writer", daemon=True)
+
+        self.data_manager = data_manager
+        self.batches = Queue(maxsize=max_batches)
+        self.error = None
+
+    def run(self):
+        """ Write batches until the stop signal (None) is received.
+        Batches with None as cases data save the rows buffered by the sinks
+        (like the stop signal)
+        """
+
+        # Confirmations of the batches written, waiting for the sinks to save
+        # their buffered rows (so the checkpoints never skip unsaved rows)
+        confirmations = []
+
+        while True:
+            batch = self.batches.get()
+            stop = batch is None
+            if stop:
+                batch = (None, None, None)
+
+            # Skip the pending batches after an error (reported to the main thread)
+            if self.error:
+                if stop:
+                    break
+                continue
+
+            cases_data, on_written, metadata = batch
+            try:
+                rows_written = 0
+                if cases_data is None:
+                    self.data_manager.flush()
+                elif cases_data:
+                    rows_written = self.data_manager.write_output_data(
+                        cases_data, metadata)
+
+                # Confirm the batches saved (like saving a checkpoint)
+                if on_written:
+                    confirmations.append((on_written, rows_written))
+                if not self.data_manager.has_pending_rows():
+                    for on_written, rows_written in confirmations:
+                        on_written(rows_written)
+                    confirmations = []
+            except Exception as error:
+                self.error = error
+
+            if stop:
+                break
+
+    def __raise_error__(self):
+        """ Raise in the current thread the error of the writer (if any) """
+
+        if self.error:
+            raise self.error
+
+    def put(self, cases_data: list[dict], on_written=None, metadata: dict = None):
+        """ Queue a batch of cases data to be written
+
+        Args:
+            cases_data (list[dict]): cases data, like DataManager.write_output_data
+            on_written (callable): function called with the number of rows
+                written, after the batch is saved (optional)
+            metadata (dict): data of the batch, like page number and shard (optional)
+        """
+
+        self.__raise_error__()
+        self.batches.put((cases_data, on_written, metadata))
+
+    def flush(self):
+        """ Wait until the queued batches are written, with the rows buffered
+        by the sinks (raise the writer error, if any) """
+
+        written = threading.Event()
+        self.__raise_error__()
+        self.batches.put((None, lambda _: written.set(), None))
+        while not written.wait(1):
+            self.__raise_error__()
+
+    def close(self):
+        """ Write the pending batches, stop the writer and raise its error (if any) """
+
+        if self.is_alive():
+            self.batches.put(None)
+            self.join()
+
+        self.__raise_error__()
@@ -0,0 +1,223 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from libs.web_scraping import WebScraping
+from libs.decorators import track_time
+from libs.metrics import metrics
+
+
+class SessionExpiredError(Exception):
+    """ The api rejected the session cookies (login required) """
+
+
+class ApiScraper ():
+    """ Scrape the search results calling the site api directly (json over
+    http), with the session cookies of a logged in browser.
+
+    Experimental: the api paths, payload and response keys below are not
+    verified against the site yet (only against the local mock site) """
+
+    # Api paths, relative to the base url
+    paths = {
+        "search": "CourtRecordsSearch/api/search/advanced",
+    }
+
+    # Keys of the search response
+    response_keys = {
+        "cases": "Results",
+        "page": "Page",
+        "pages": "TotalPages",
+    }
+
+    # Case fields (like DataManager.write_output_data) -> keys in each api case
+    fields = {
+        "description": "CaseStyle",
+        "number": "CaseNumber",
+        "location": "CourtName",
+        "type": "CaseType",
+        "filed_date": "FiledDate",
+    }
+
+    def __init__(self, cookies: list, base_url: str = "https://research.txcourts.gov/",
+                 user_agent: str = "", page_size: int = 100, time_out: int = 60):
+        """ Create the http session
+
+        Args:
+            cookies (list): browser cookies (like driver.get_cookies())
+            base_url (str): site url
+            user_agent (str): user agent of the browser that owns the cookies
+            page_size (int): cases requested in each page
+            time_out (int): max seconds to wait for each response
+        """
+
+        self.base_url = base_url.rstrip("/") + "/"
+        self.page_size = page_size
+        self.time_out = time_out
+
+        # Pooled http session (connections are reused between pages)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "application/json, text/plain, */*",
+            "Content-Type": "application/json",
+            "X-Requested-With": "XMLHttpRequest",
+        })
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+
+    @classmethod
+    def from_browser(cls, browser: WebScraping, **kwargs) -> "ApiScraper":
+        """ Create an api scraper with the session of a logged in browser
+
+        Args:
+            browser (WebScraping): logged in browser (like Scraper after login)
+            **kwargs: extra arguments of the constructor
+
+        Returns:
+            ApiScraper: api scraper
+        """
+
+        cookies = browser.driver.get_cookies()
+        user_agent = browser.driver.execute_script("return navigator.userAgent")
+        return cls(cookies, user_agent=user_agent, **kwargs)
+
+    def get_search_payload(self, start_date: str, end_date: str,
+                           case_types: list[str], page: int) -> dict:
+        """ Return the body of the search request (same conditions as the
+        advanced search form)
+
+        Args:
+            start_date (str): start date in format "mm/dd/yyyy"
+            end_date (str): end date in format "mm/dd/yyyy"
+            case_types (list[str]): case types to search
+            page (int): page number (starting in 1)
+
+        Returns:
+            dict: request body
+        """
+
+        return {
+            "conditions": [
+                {
+                    "fieldOption": "Case Type",
+                    "values": case_types,
+                },
+                {
+                    "fieldOption": "Case Filed Date",
+                    "fromValue": start_date,
+                    "toValue": end_date,
+                },
+            ],
+            "page": page,
+            "pageSize": self.page_size,
+        }
+
+    @classmethod
+    def parse_cases(cls, response_data: dict) -> list[dict]:
+        """ Convert the cases of a search response to cases data
+        (used for api responses and for responses captured by the browser)
+
+        Args:
+            response_data (dict): json data of the search response
+
+        Returns:
+            list[dict]: list of cases data (like Scraper.get_current_cases_data)
+        """
+
+        cases_data = []
+        for case in response_data.get(cls.response_keys["cases"]) or []:
+            case_data = {}
+            for field, key in cls.fields.items():
+                value = case.get(key)
+                case_data[field] = "" if value is None else str(value).strip()
+            cases_data.append(case_data)
+
+        return cases_data
+
+    @track_time("api_page")
+    def get_page(self, start_date: str, end_date: str, case_types: list[str],
+                 page: int) -> tuple[list[dict], int]:
+        """ Request a results page
+
+        Args:
+            start_date (str): start date in format "mm/dd/yyyy"
+            end_date (str): end date in format "mm/dd/yyyy"
+            case_types (list[str]): case types to search
+            page (int): page number (starting in 1)
+
+        Returns:
+            tuple[list[dict], int]: cases data and total pages (0 if the
+                response does not include it)
+        """
+
+        response = self.session.post(
+            self.base_url + self.paths["search"],
+            json=self.get_search_payload(start_date, end_date, case_types, page),
+            timeout=self.time_out,
+            allow_redirects=False,
+        )
+
+        # Redirects to login page or unauthorized means session expired
+        if response.status_code in (301, 302, 401, 403):
+            raise SessionExpiredError("The api session expired. Login again.")
+        response.raise_for_status()
+
+        response_data = response.json()
+        pages = response_data.get(self.response_keys["pages"]) or 0
+        return self.parse_cases(response_data), int(pages)
+
+    def get_cases_pages(self, start_date: str, end_date: str, case_types: list[str],
+                        start_page: int = 1, end_page: int = 0, check_session=None):
+        """ Iterate the results pages of a search
+
+        Args:
+            start_date (str): start date in format "mm/dd/yyyy"
+            end_date (str): end date in format "mm/dd/yyyy"
+            case_types (list[str]): case types to search
+            start_page (int): first page to request
+            end_page (int): last page to request (0 for all the pages)
+            check_session (callable): function called in an empty page, before
+                ending the search, that raises an error if the session was lost
+
+        Yields:
+            tuple[int, list[dict]]: page number and its cases data
+        """
+
+        page = start_page
+        while True:
+            print(f"Requesting results page {page}...")
+            cases_data, pages = self.get_page(start_date, end_date, case_types, page)
+            if not cases_data:
+                if check_session:
+                    check_session()
+                break
+
+            # Use the searched type when the api does not return it
+            # (required to know the type of each case, with several types)
+            for case_data in cases_data:
+                if not case_data["type"]:
+                    if len(case_types) > 1:
+                        raise ValueError(
+                            "The api does not return the type of each case. Search "
+                            "one case type at a time (MULTI_SELECT_CASE_TYPES=False)"
+                        )
+                    case_data["type"] = case_types[0]
+
+            metrics.add_count("pages_scraped")
+            metrics.add_count("rows_scraped", len(cases_data))
+            yield page, cases_data
+
+            # Without total pages, request pages until an empty one
+            if (pages and page >= pages) or (end_page and page >= end_page):
+                break
+            page += 1
@@ -1,19 +1,50 @@
-import os
-from time import sleep
+import json
 
 from libs.scraper_login import ScraperLogin
-from libs.decorators import save_screnshot
-
-
-# Paths
-current_path = os.path.dirname(os.path.abspath(__file__))
-cookies_path = os.path.join(current_path, "cookies.pkl")
+from libs.session_store import SessionStore
+from libs.scraper_api import ApiScraper
+from libs.decorators import save_screnshot, track_time
+from libs.metrics import metrics
 
 
 class Scraper(ScraperLogin):
 
+    # Selectors of the results page (shared by all extraction modes).
+    # Unverified: the "type" selector is not checked against the site yet
+    # (only against the local fixtures). Without it, the type of each case is
+    # unknown and searches with several case types fail
+    results_selectors = {
+        "row": '.list-group > div',
+        "active_page": '.page-item.active',
+        "data": {
+            "description": '.card-title',
+            "number": '.card-sub-header',
+            "location": '.row:last-child .col-md-2:first-child span',
+            "filed_date": '.row:last-child .col-md-2:last-child > [ng-bind]',
+            "type": '.row:last-child [ng-bind*="casetype" i]',
+        }
+    }
+
+    # Case types available to search
+    case_types = [
+        "TAX DELINQUENCY",
+        "QUIET TITLE",
+        "FORECLOSURE - OTHER",
+        "FORECLOSURE - HOME EQUITY-EXPEDITED",
+        "DEBT/CONTRACT - OTHER",
+        "OTHER CIVIL",
+        "OTHER PROPERTY",
+    ]
+
     def __init__(self, user_email: str, user_password: str, headless: bool = False,
-                 debug: bool = False):
+                 debug: bool = False, bulk_extraction: bool = True,
+                 case_type: str = "", network_extraction: bool = False,
+                 screenshots_rate: float = 0, diagnostics_folder: str = "diagnostics",
+                 profile_commands: bool = False,
+                 block_resources: bool = False, page_load_strategy: str = "normal",
+                 navigation_budget: float = 30, chrome_folder: str = "",
+                 session_store: SessionStore = None,
+                 home_page: str = "https://research.txcourts.gov/CourtRecordsSearch/#!"):
         """ Initialize the scraper.
 
         Args:
@@ -21,31 +52,69 @@ class Scraper(ScraperLogin):
             user_password (str): user password
             headless (bool): run the browser in headless mode
             debug (bool): run the scraper in debug mode
+            bulk_extraction (bool): extract each results page with a single
+                js call, instead of one request per row and field
+            case_type (str): case type to search. If empty, it is requested
+                to the user when filtering
+            network_extraction (bool): read the cases from the search responses
+                downloaded by the browser (with the page as fallback)
+            screenshots_rate (float): fraction of steps (0 to 1) with a screenshot
+                in the diagnostics
+            diagnostics_folder (str): folder to save the diagnostics of the
+                failed steps
+            profile_commands (bool): count and time each webdriver command
+            block_resources (bool): skip images, fonts, media and trackers
+            page_load_strategy (str): "normal", "eager" or "none"
+            navigation_budget (float): max seconds to load the home page
+            chrome_folder (str): persistent chrome profile folder, to keep the
+                http cache and the session between runs (one for each browser)
+            session_store (SessionStore): saved sessions, shared by the workers
+            home_page (str): url of the court records search page
         """
 
         super().__init__(
             user_email=user_email,
             user_password=user_password,
-            headless=headless
+            headless=headless,
+            network_logs=network_extraction,
+            screenshots_rate=screenshots_rate,
+            diagnostics_folder=diagnostics_folder,
+            profile_commands=profile_commands,
+            block_resources=block_resources,
+            page_load_strategy=page_load_strategy,
+            navigation_budget=navigation_budget,
+            chrome_folder=chrome_folder,
+            session_store=session_store,
+            home_page=home_page,
         )
 
         # Constrol variables
         self.filters_applied_num = 0
-        self.case_type = ""
+        self.current_page = 0
+        self.case_type = case_type
+        self.search_case_types = [case_type] if case_type else []
 
         # Debug mode
         self.debug = debug
 
+        # Extraction mode
+        self.bulk_extraction = bulk_extraction
+        self.network_extraction = network_extraction
+
     @save_screnshot
-    def __wait_loading__(self):
-        """ Wait until the loading spinner is gone """
-        
+    def __wait_loading__(self, time_out: int = 60):
+        """ Wait until the search requests end and the loading spinner is gone
+
+        Args:
+            time_out (int): max seconds to wait for each condition
+        """
+
         selectors = {
             "loading": '[ng-if="IsLoading"]',
         }
-        
-        self.refresh_selenium()
-        self.wait_die(selectors["loading"])
+
+        self.wait_angular_idle(time_out)
+        self.wait_die(selectors["loading"], time_out)
 
     @save_screnshot
     def __add_filter_condition__(self, value: str):
@@ -66,17 +135,48 @@ class Scraper(ScraperLogin):
         # Click in "add" button is its not first condition
         if index > 1:
             self.click_js(selectors["add_btn"])
-            self.refresh_selenium()
 
         # Select search by
+        self.wait_clickable(selectors["search_by_dropdown"])
         self.select_drop_down_text(selectors["search_by_dropdown"], value)
-        self.refresh_selenium()
+        self.wait_angular_idle()
 
         # Update filters counter
         self.filters_applied_num += 1
 
+    @classmethod
+    def request_case_type(cls, debug: bool = False) -> str:
+        """ Ask the user to choose a case type
+
+        Args:
+            debug (bool): skip the question and use the first case type
+
+        Returns:
+            str: case type name
+        """
+
+        if debug:
+            print("\t\tDEBUG: Using first case type")
+            return cls.case_types[0]
+
+        while True:
+            print("Case types: ")
+            for case_type_nmame in cls.case_types:
+                case_type_index = cls.case_types.index(case_type_nmame)
+                print(f"{case_type_index + 1}. {case_type_nmame}")
+
+            try:
+                case_type_input = int(
+                    input("Enter the number of the case type: "))
+                if case_type_input < 1:
+                    raise IndexError
+                return cls.case_types[case_type_input - 1]
+            except (ValueError, IndexError):
+                print("ERROR: Invalid case type")
+
     def __search_by_case_type__(self):
-        """ Filter by specific case type
+        """ Filter by the search case types (one or more, selected in the
+        same selection dialog)
         """
         
         print("\tSearching by case type...")
@@ -86,58 +186,54 @@ class Scraper(ScraperLogin):
             'input': '#searchText',
             'search_btn': '#searchSelectionButton',
             'option': '#selectAllResults + div label',
+            'options': '#selectAllResults ~ div label',
             'accept_btn': '#doneSelectionButton',
         }
 
         # Request case type to user
-        case_types = [
-            "TAX DELINQUENCY",
-            "QUIET TITLE",
-            "FORECLOSURE - OTHER",
-            "FORECLOSURE - HOME EQUITY-EXPEDITED",
-            "DEBT/CONTRACT - OTHER",
-            "OTHER CIVIL",
-            "OTHER PROPERTY",
-        ]
-
-        if self.debug:
-            print("\t\tDEBUG: Using first case type")
-            self.case_type = case_types[0]
-        else:
-            while True:
-                print("Case types: ")
-                for case_type_nmame in case_types:
-                    case_type_index = case_types.index(case_type_nmame)
-                    print(f"{case_type_index + 1}. {case_type_nmame}")
-
-                try:
-                    case_type_input = int(
-                        input("Enter the number of the case type: "))
-                    self.case_type = case_types[case_type_input - 1]
-                except (ValueError, IndexError):
-                    print("ERROR: Invalid case type")
-                    continue
-                break
+        if not self.search_case_types:
+            self.case_type = self.request_case_type(self.debug)
+            self.search_case_types = [self.case_type]
 
         # Select search by "Case Type"
         self.__add_filter_condition__("Case Type")
         
         # Click in "select" button
+        self.wait_clickable(selectors["select_btn"])
         self.click_js(selectors["select_btn"])
-        sleep(3)
-        self.refresh_selenium()
-
-        # Type value in search bar and submit
-        self.send_data(selectors["input"], self.case_type)
-        self.click_js(selectors["search_btn"])
-        sleep(5)
-
-        # Select first option and accept
-        self.refresh_selenium()
-        self.click_js(selectors["option"])
-        sleep(1)
+        self.wait_clickable(selectors["input"])
+
+        for case_type in self.search_case_types:
+
+            # Type value in search bar and submit
+            self.clear_input(selectors["input"])
+            self.send_data(selectors["input"], case_type)
+            self.click_js(selectors["search_btn"])
+            self.wait_angular_idle()
+
+            # Check the option with the same name (without unchecking it
+            # if it is already checked)
+            self.wait_load(selectors["option"])
+            script = """
+            const [selector, text] = arguments
+            const label = Array.from(document.querySelectorAll(selector)).find(
+                label => label.innerText.trim().toUpperCase() === text.trim().toUpperCase()
+            )
+            if (!label) {
+                return false
+            }
+            const checkbox = label.control || label.querySelector("input[type=checkbox]")
+            if (!checkbox || !checkbox.checked) {
+                label.click()
+            }
+            return true
+            """
+            if not self.driver.execute_script(script, selectors["options"], case_type):
+                raise ValueError(f"Case type not found in the site: {case_type}")
+
+        # Accept selection
         self.click_js(selectors["accept_btn"])
-        self.refresh_selenium()
+        self.wait_die(selectors["accept_btn"])
 
     @save_screnshot
     def __search_by_dates__(self, start_date: str, end_date: str):
@@ -161,7 +257,6 @@ class Scraper(ScraperLogin):
         # Set values to date inputs
         self.send_data(selectors["start_date"], start_date)
         self.send_data(selectors["end_date"], end_date)
-        self.refresh_selenium()
 
     @save_screnshot
     def open_advanced_search(self):
@@ -169,14 +264,36 @@ class Scraper(ScraperLogin):
 
         selectors = {
             "advanced_search": '#btnAdvancedSearch',
+            "condition": '#conditions [ng-repeat] select[ng-model="condition.fieldOption"]',
         }
 
         print("Opening advanced search...")
 
+        self.wait_clickable(selectors["advanced_search"])
         self.click_js(selectors["advanced_search"])
-        sleep(3)
-        self.refresh_selenium()
+        self.wait_clickable(selectors["condition"])
+
+    @save_screnshot
+    def new_search(self, case_types: list[str]):
+        """ Start a new advanced search in the current session
+        (without login again)
+
+        Args:
+            case_types (list[str]): case types to search (all in the same search)
+        """
+
+        print(f"\nNew search for case types: {', '.join(case_types)}...")
+
+        self.search_case_types = case_types
+        self.filters_applied_num = 0
+
+        # Type used for the cases without type in the results
+        self.case_type = case_types[0] if len(case_types) == 1 else ""
+
+        self.__set_home_page__()
+        self.open_advanced_search()
         
+    @track_time("submit")
     @save_screnshot
     def submit(self):
         """ Submit the search """
@@ -190,6 +307,50 @@ class Scraper(ScraperLogin):
         self.click_js(selectors["submit_btn"])
         self.__wait_loading__()
 
+    @save_screnshot
+    def sort_by_filed_date(self) -> bool:
+        """ Sort the results by filed date, newest first (if the results page
+        has a sort option for it).
+
+        Experimental: the sort selector is not verified against the site yet
+        (only against the local mock site)
+
+        Returns:
+            bool: True if the results were sorted
+        """
+
+        selectors = {
+            "sort": 'select[ng-model*="sort" i]',
+        }
+
+        # Select the filed date option (descending if available)
+        script = """
+        const select = document.querySelector(arguments[0])
+        if (!select) {
+            return false
+        }
+        const options = Array.from(select.options)
+        const filedOptions = options.filter(
+            option => /filed/i.test(option.text)
+        )
+        const option = filedOptions.find(
+            option => /desc|newest/i.test(option.text)
+        ) || filedOptions[0]
+        if (!option) {
+            return false
+        }
+        select.selectedIndex = options.indexOf(option)
+        select.dispatchEvent(new Event("change"))
+        return true
+        """
+
+        sorted_results = self.driver.execute_script(script, selectors["sort"])
+        if sorted_results:
+            print("\tSorting results by filed date...")
+            self.__wait_loading__()
+        return sorted_results
+
+    @track_time("filter")
     @save_screnshot
     def filter(self, start_date: str, end_date: str):
         """ Filter cases applying the given date range and search term
@@ -204,6 +365,7 @@ class Scraper(ScraperLogin):
         self.__search_by_case_type__()
         self.__search_by_dates__(start_date, end_date)
         
+    @track_time("get_cases_data")
     @save_screnshot
     def get_current_cases_data(self) -> list[dict]:
         """ Return the data of the current cases in the current results page
@@ -217,65 +379,242 @@ class Scraper(ScraperLogin):
                 filed_date (str): case filed date
         """
         
-        selectors = {
-            "row": '.list-group > div',
-            "active_page": '.page-item.active',
-            "data": {
-                "description": '.card-title',
-                "number": '.card-sub-header',
-                "location": '.row:last-child .col-md-2:first-child span',
-                "filed_date": '.row:last-child .col-md-2:last-child > [ng-bind]',
-            }
-        }
-        
-        # Get current page and rows
-        current_page = self.get_text(selectors["active_page"])
-        rows_num = len(self.get_elems(selectors["row"]))
-        
+        cases_data = []
+        if self.network_extraction:
+            current_page, cases_data = self.__get_cases_data_network__()
+
+        # Read the page when no response was captured
+        if not cases_data:
+            if self.bulk_extraction:
+                current_page, cases_data = self.__get_cases_data_bulk__()
+            else:
+                current_page, cases_data = self.__get_cases_data_by_row__()
+
         # Validate rows
-        if rows_num == 0:
+        if not cases_data:
             print("No cases found for this search.")
             return []
-        
+
+        self.current_page = int(current_page) if str(current_page).isdigit() else 0
         print(f"Scraping results from page {current_page}...")
+        metrics.add_count("pages_scraped")
+        metrics.add_count("rows_scraped", len(cases_data))
         print("\tGetting cases data...")
-        
+
+        # Add type (when the result card does not show it). With several
+        # case types in the search, the type of each case must be read
+        for case_data in cases_data:
+            if not case_data.get("type"):
+                if not self.case_type:
+                    raise ValueError(
+                        "The results do not show the type of each case. Search "
+                        "one case type at a time (MULTI_SELECT_CASE_TYPES=False)"
+                    )
+                case_data["type"] = self.case_type
+
+        # Commands used to reach and read the page
+        if self.profiler:
+            self.profiler.end_page(self.current_page)
+
+        return cases_data
+
+    def __get_cases_data_network__(self) -> tuple[str, list[dict]]:
+        """ Get current page and rows data from the last search response
+        downloaded by the browser
+
+        Returns:
+            tuple[str, list[dict]]: current page and rows data
+                (empty if no response was captured)
+        """
+
+        responses = self.get_network_responses(ApiScraper.paths["search"])
+        if not responses:
+            return "", []
+
+        try:
+            response_data = json.loads(responses[-1])
+        except ValueError:
+            return "", []
+
+        current_page = str(response_data.get(ApiScraper.response_keys["page"], ""))
+        return current_page, ApiScraper.parse_cases(response_data)
+
+    def __get_cases_data_bulk__(self) -> tuple[str, list[dict]]:
+        """ Get current page and rows data with a single js call
+
+        Returns:
+            tuple[str, list[dict]]: current page and rows data
+        """
+
+        selectors = self.results_selectors
+        page_data = self.get_texts_bulk(
+            selectors["row"],
+            selectors["data"],
+            {"active_page": selectors["active_page"]}
+        )
+        return page_data["page"]["active_page"], page_data["rows"]
+
+    def __get_cases_data_by_row__(self) -> tuple[str, list[dict]]:
+        """ Get current page and rows data, requesting each field of each row
+
+        Returns:
+            tuple[str, list[dict]]: current page and rows data
+        """
+
+        selectors = self.results_selectors
+
+        # Get current page and rows
+        current_page = self.get_text(selectors["active_page"])
+        rows_num = len(self.get_elems(selectors["row"]))
+
         # Get data from each row
         cases_data = []
         for index in range(rows_num):
             case_data = {}
-            
+
             # Get data from selectors
             for selector_name, selector_value in selectors["data"].items():
                 selector = f'{selectors["row"]}:nth-child({index + 1}) {selector_value}'
                 case_data[selector_name] = self.get_text(selector)
-                
-            # Add type
-            case_data["type"] = self.case_type
-            
+
             # Save row
             cases_data.append(case_data)
-        
-        return cases_data
-    
+
+        return current_page, cases_data
+
+    def get_last_page(self) -> int:
+        """ Return the number of results pages of the current search
+
+        Returns:
+            int: last page number (0 if there are no results, None if it is
+                unknown: the paginator only shows the pages near the current one)
+        """
+
+        selectors = {
+            "pagination": '[ng-click="selectPage(page + 1, $event)"]',
+            "next": 'li:not(.disabled) [ng-click="selectPage(page + 1, $event)"]',
+            "page_links": '.page-item .page-link',
+        }
+
+        # Read total pages from the paginator scope. Without it, the highest
+        # page link is the last page only when there is no next page
+        script = """
+        const [paginationSelector, nextSelector, linksSelector, rowsSelector] = arguments
+        const pagination = document.querySelector(paginationSelector)
+        if (pagination && window.angular) {
+            const scope = angular.element(pagination).scope()
+            if (scope && scope.totalPages) {
+                return scope.totalPages
+            }
+        }
+        if (!document.querySelector(rowsSelector)) {
+            return 0
+        }
+        if (!pagination) {
+            return 1
+        }
+        if (document.querySelector(nextSelector)) {
+            return null
+        }
+        const pages = Array.from(document.querySelectorAll(linksSelector))
+            .map(link => parseInt(link.innerText.trim()))
+            .filter(page => !isNaN(page))
+        return pages.length ? Math.max(...pages) : null
+        """
+        last_page = self.driver.execute_script(
+            script, selectors["pagination"], selectors["next"],
+            selectors["page_links"], self.results_selectors["row"]
+        )
+        return None if last_page is None else int(last_page)
+
+    @track_time("go_to_page")
+    @save_screnshot
+    def go_to_page(self, page: int) -> bool:
+        """ Go directly to a results page (without loading the previous ones),
+        with its link in the paginator, or with the paginator scope
+
+        Args:
+            page (int): page number
+
+        Returns:
+            bool: True if the page was reached, False if it is after the
+                last page
+
+        Raises:
+            TimeoutError: if the page exists (or the last page is unknown)
+                but it was not reached
+        """
+
+        selectors = {
+            "pagination": '[ng-click="selectPage(page + 1, $event)"]',
+            "page_links": '.page-item:not(.active) .page-link',
+        }
+
+        current_page = self.get_text(self.results_selectors["active_page"])
+        if current_page == str(page):
+            return True
+
+        last_page = self.get_last_page()
+        if page < 1 or (last_page is not None and page > last_page):
+            return False
+
+        print(f"\tGoing to page {page}...")
+
+        # Click the page link, or select the page with the paginator scope
+        if not self.click_by_text_js(selectors["page_links"], str(page)):
+            script = """
+            const [selector, page] = arguments
+            const scope = angular.element(document.querySelector(selector)).scope()
+            scope.$apply(() => scope.selectPage(page))
+            """
+            self.driver.execute_script(script, selectors["pagination"], page)
+
+        self.wait_until(
+            lambda: self.get_text(self.results_selectors["active_page"]) == str(page),
+            30,
+            f"results page {page}"
+        )
+        self.__wait_loading__()
+        return True
+
+    def get_page_cases_data(self, page: int) -> list[dict]:
+        """ Return the cases data of a specific results page
+        (like for scraping again a failed page)
+
+        Args:
+            page (int): page number
+
+        Returns:
+            list[dict]: list of cases data (empty if the page does not exist)
+        """
+
+        if not self.go_to_page(page):
+            return []
+        return self.get_current_cases_data()
+
+    @track_time("next_page")
     def go_next_page(self) -> bool:
         """ Go to next results page
         
         Returns:
-            bool: True if there is a next page, False otherwise
+            bool: True if moved to the next page, False if the current
+                page is the last one
         """
         
         selectors = {
             "next": 'li:not(.disabled) [ng-click="selectPage(page + 1, $event)"]'
         }
         
+        # Validate if there is a next page
+        next_page_btn = self.get_elems(selectors["next"])
+        if not next_page_btn:
+            return False
+
         print("\tGoing to next page...")
         
-        # Go next page
+        # Go next page and wait until the active page changes
+        current_page = self.get_text(self.results_selectors["active_page"])
         self.click_js(selectors["next"])
+        self.wait_text_change(self.results_selectors["active_page"], current_page)
         self.__wait_loading__()
-        self.refresh_selenium()
-        
-        # Validate if there is a next page
-        next_page_btn = self.get_elems(selectors["next"])
-        return bool(next_page_btn)
\ No newline at end of file
+        return True
\ No newline at end of file
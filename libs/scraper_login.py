@@ -1,70 +1,134 @@
 import os
-import pickle
-from time import sleep
 
 from libs.web_scraping import WebScraping
-from libs.decorators import save_screnshot
+from libs.session_store import SessionStore
+from libs.decorators import save_screnshot, track_time
 
 
 # Paths
 current_path = os.path.dirname(os.path.abspath(__file__))
-cookies_path = os.path.join(current_path, "cookies.pkl")
+sessions_path = os.path.join(current_path, "sessions.json")
+
+
+class SessionLostError(Exception):
+    """ The site ended the browser session (login required) """
+
+
+class LoginError(Exception):
+    """ The account can not login (wrong credentials) """
 
 
 class ScraperLogin(WebScraping):
 
-    def __init__(self, user_email: str, user_password: str, headless: bool = False):
+    def __init__(self, user_email: str, user_password: str, headless: bool = False,
+                 network_logs: bool = False, screenshots_rate: float = 0,
+                 diagnostics_folder: str = "diagnostics",
+                 profile_commands: bool = False, block_resources: bool = False,
+                 page_load_strategy: str = "normal", navigation_budget: float = 30,
+                 chrome_folder: str = "", session_store: SessionStore = None,
+                 home_page: str = "https://research.txcourts.gov/CourtRecordsSearch/#!"):
         """ Initialize the scraper.
 
         Args:
             user_email (str): user email
             user_password (str): user password
             headless (bool): run the browser in headless mode
+            network_logs (bool): save network events of the browser
+            screenshots_rate (float): fraction of steps (0 to 1) with a screenshot
+                in the diagnostics
+            diagnostics_folder (str): folder to save the diagnostics of the
+                failed steps
+            profile_commands (bool): count and time each webdriver command
+            block_resources (bool): skip images, fonts, media and trackers
+            page_load_strategy (str): "normal", "eager" or "none"
+            navigation_budget (float): max seconds to load the home page
+            chrome_folder (str): persistent chrome profile folder, to keep the
+                http cache and the session between runs (one for each browser)
+            session_store (SessionStore): saved sessions, shared by the workers.
+                Defaults to the store in 'sessions_path'
+            home_page (str): url of the court records search page
         """
 
         print("Starting scraper...")
 
         super().__init__(
             headless=headless,
+            network_logs=network_logs,
+            screenshots_rate=screenshots_rate,
+            diagnostics_folder=diagnostics_folder,
+            profile_commands=profile_commands,
+            block_resources=block_resources,
+            page_load_strategy=page_load_strategy,
+            navigation_budget=navigation_budget,
+            chrome_folder=chrome_folder,
         )
 
         # Global data
-        self.home_page = "https://research.txcourts.gov/CourtRecordsSearch/#!"
+        self.home_page = home_page
         self.global_selectors = {
             "spinner": '[mdb-progress-spinner]',
             "btn_login": '#signInLink',
+            "btn_advanced_search": '#btnAdvancedSearch',
         }
         self.user_email = user_email
         self.user_password = user_password
+        self.session_store = session_store or SessionStore(sessions_path)
+        self.session = None
 
-        # Setup
-        self.__load_cookies__()
-        self.__accept_close_session__()
-        sleep(3)
+        # Setup (cookies applied in the first navigation)
+        self.__load_session__()
         
         # Constrol variables
         self.filters_applied_num = 0
 
     @save_screnshot
     def __set_home_page__(self):
-        """ Load home page and refresh """
+        """ Load home page and wait until it is ready """
 
-        self.set_page(self.home_page)
-        sleep(4)
-        self.refresh_selenium()
+        self.set_page(
+            self.home_page,
+            ready=f'{self.global_selectors["btn_login"]}, '
+                  f'{self.global_selectors["btn_advanced_search"]}'
+        )
+        self.wait_angular_idle()
 
+    @track_time("load_session")
     @save_screnshot
-    def __load_cookies__(self):
-        """ Load cookies from local file """
+    def __load_session__(self) -> bool:
+        """ Set the cookies of the saved session of the account in the browser,
+        if it is not expired and it is not the current one.
+        Before opening the site, the cookies are applied in the first navigation
 
-        if not os.path.exists(cookies_path):
-            return
+        Returns:
+            bool: True if a new session was loaded, False otherwise
+        """
+
+        session = self.session_store.get(self.user_email)
+        if not session:
+            return False
+
+        if self.session and self.session["saved"] == session["saved"]:
+            return False
 
-        with open(cookies_path, "rb") as file:
-            cookies = pickle.load(file)
-        self.set_cookies(cookies)
-        self.driver.refresh()
-        self.refresh_selenium()
+        cdp_cookies = []
+        for cookie in session["cookies"]:
+            cdp_cookie = {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie["domain"],
+                "path": cookie.get("path", "/"),
+                "secure": cookie.get("secure", False),
+                "httpOnly": cookie.get("httpOnly", False),
+            }
+            if "expiry" in cookie:
+                cdp_cookie["expires"] = cookie["expiry"]
+            if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+                cdp_cookie["sameSite"] = cookie["sameSite"]
+            cdp_cookies.append(cdp_cookie)
+
+        self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": cdp_cookies})
+        self.session = session
+        return True
 
     @save_screnshot
     def __validate_login__(self) -> bool:
@@ -96,11 +160,12 @@ class ScraperLogin(WebScraping):
         btn_close_elem = self.get_elems(selectors["btn_close"])
         if btn_close_elem:
             self.click(selectors["btn_close"])
-            self.refresh_selenium()
+            self.wait_die(selectors["btn_close"])
+            self.wait_angular_idle()
             
     @save_screnshot
-    def login(self):
-        """ Login with user credentials """
+    def __submit_login__(self):
+        """ Submit the login form with user credentials """
 
         selectors = {
             "email": '#UserName',
@@ -108,20 +173,11 @@ class ScraperLogin(WebScraping):
             "btn_submit": '#sign-in-btn',
         }
 
-        is_logged = self.__validate_login__()
-
-        # sKip if the user is already logged in
-        if is_logged:
-            print("\tUser is already logged in")
-            return
-
-        # Login if the user is not logged in
-        print("\tUser is not logged in")
         print(f"\tLogin with email '{self.user_email}'...")
 
         # Go to login page
         self.click_js(self.global_selectors["btn_login"])
-        self.refresh_selenium()
+        self.wait_clickable(selectors["email"], time_out=30)
 
         self.clear_input(selectors["email"])
         self.clear_input(selectors["password"])
@@ -130,21 +186,83 @@ class ScraperLogin(WebScraping):
         self.send_data(selectors["password"], self.user_password)
 
         self.click_js(selectors["btn_submit"])
-        sleep(5)
-        self.refresh_selenium()
+        try:
+            self.wait_die(selectors["btn_submit"], time_out=30)
+            self.wait_angular_idle()
+        except TimeoutError:
+            # Login form still visible: the validation below reports the error
+            pass
 
         self.__accept_close_session__()
 
-        # Validate login (again)
+    @track_time("login")
+    @save_screnshot
+    def login(self):
+        """ Login with user credentials (or with the saved session)
+
+        Raises:
+            LoginError: if the login fails
+        """
+
         is_logged = self.__validate_login__()
-        if not is_logged:
-            print("\tERROR: Login failed. Check credentials and try again.")
-            self.kill()
-            quit()
 
-        # Save cookies in local file
-        cookies = self.driver.get_cookies()
-        with open(cookies_path, "wb") as file:
-            pickle.dump(cookies, file)
+        # sKip if the user is already logged in
+        if is_logged:
+            print("\tUser is already logged in")
+            return
 
-            
+        print("\tUser is not logged in")
+
+        # Refresh the session, one worker at a time
+        with self.session_store.lock(self.user_email):
+
+            # Reuse the session of other worker, saved while waiting
+            if self.__load_session__():
+                print("\tUsing the session saved by other worker")
+                is_logged = self.__validate_login__()
+                if is_logged:
+                    return
+
+            self.__submit_login__()
+
+            # Validate login (again), reloading the home page only if the
+            # advanced search button is not already visible
+            is_logged = self.is_visible(self.global_selectors["btn_advanced_search"])
+            if not is_logged:
+                is_logged = self.__validate_login__()
+            if not is_logged:
+                raise LoginError(
+                    f"Login failed with '{self.user_email}'. "
+                    "Check credentials and try again."
+                )
+
+            # Share the session with the other workers
+            self.session = self.session_store.save(
+                self.user_email, self.driver.get_cookies()
+            )
+
+    def check_session(self, reload: bool = False):
+        """ Raise an error if the site ended the session (the login link is
+        visible), forgetting the saved session
+
+        Args:
+            reload (bool): load the home page before checking (when the browser
+                is not in use, like with the api engine)
+
+        Raises:
+            SessionLostError: if the session was ended
+        """
+
+        if reload:
+            self.__set_home_page__()
+
+        if not self.is_visible(self.global_selectors["btn_login"]):
+            return
+
+        # Keep the session saved by other worker after this one
+        with self.session_store.lock(self.user_email):
+            session = self.session_store.get(self.user_email)
+            if session and self.session and session["saved"] == self.session["saved"]:
+                self.session_store.delete(self.user_email)
+
+        raise SessionLostError(f"The session of '{self.user_email}' was ended")
@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+
+# File locks (posix or windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class SessionStore ():
+    """ Login sessions (cookies) of each account, saved in a local json file
+    shared by all the workers and processes, with the expiry of each session.
+
+    The file is replaced atomically, so it can be read without locks.
+    The refresh of a session (login) is done holding the 'lock' of its
+    account, so only one worker logs in and the others reuse its session.
+    """
+
+    def __init__(self, file_path: os.PathLike, max_age: float = 8 * 3600,
+                 session_cookies: list = []):
+        """ Save settings
+
+        Args:
+            file_path (os.PathLike): path of the json file
+            max_age (float): max seconds of a session, for sessions without
+                session cookies expiry (or with a later one)
+            session_cookies (list): names of the auth / session cookies of the
+                site. Only their expiry is used (the other cookies, like
+                trackers, do not end the session). Defaults to [] (max_age)
+        """
+
+        self.file_path = file_path
+        self.lock_path = f"{file_path}.lock"
+        self.max_age = max_age
+        self.session_cookies = session_cookies
+        self.locks_lock = threading.Lock()
+        self.thread_locks = {}
+        self.lock_files = {}
+
+    def __read__(self) -> dict:
+        """ Return the sessions saved in the file (empty if it does not exist) """
+
+        if not os.path.exists(self.file_path):
+            return {}
+
+        with open(self.file_path) as file:
+            return json.load(file)
+
+    def __write__(self, sessions: dict):
+        """ Write the sessions in the file (replacing it atomically) """
+
+        temp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(sessions, file, indent=4)
+        os.replace(temp_path, self.file_path)
+
+    @contextmanager
+    def lock(self, account: str = ""):
+        """ Hold a lock between threads and processes: of an account, while
+        its session is refreshed, or of the file (without account), while
+        it is updated. Reentrant in the same thread
+
+        Args:
+            account (str): account email (empty for the file lock)
+        """
+
+        with self.locks_lock:
+            thread_lock = self.thread_locks.setdefault(account, threading.RLock())
+
+        with thread_lock:
+
+            # Already held by this thread
+            if account in self.lock_files:
+                yield
+                return
+
+            lock_path = self.lock_path
+            if account:
+                account_hash = hashlib.sha1(account.encode()).hexdigest()[:12]
+                lock_path = f"{self.file_path}.{account_hash}.lock"
+
+            with open(lock_path, "a+") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+                self.lock_files[account] = lock_file
+                try:
+                    yield
+                finally:
+                    del self.lock_files[account]
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    else:
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def get(self, account: str) -> dict:
+        """ Return the session of an account, if it is not expired
+
+        Args:
+            account (str): account email
+
+        Returns:
+            dict: session data (None if there is no valid session)
+                account (str): account email
+                cookies (list): cookies of the browser (selenium format)
+                saved (float): timestamp of the login
+                expires (float): timestamp of the expiry
+        """
+
+        session = self.__read__().get(account)
+        if not session or session["expires"] <= time.time():
+            return None
+        return session
+
+    def save(self, account: str, cookies: list) -> dict:
+        """ Save the session of an account after a login
+
+        Args:
+            account (str): account email
+            cookies (list): cookies of the browser (selenium format)
+
+        Returns:
+            dict: session data (like 'get')
+        """
+
+        # Expire with the first session cookie
+        saved = time.time()
+        expires = saved + self.max_age
+        for cookie in cookies:
+            if "expiry" in cookie and cookie["name"] in self.session_cookies:
+                expires = min(expires, cookie["expiry"])
+
+        session = {
+            "account": account,
+            "cookies": cookies,
+            "saved": saved,
+            "expires": expires,
+        }
+
+        with self.lock():
+            sessions = self.__read__()
+            sessions[account] = session
+            self.__write__(sessions)
+
+        return session
+
+    def delete(self, account: str):
+        """ Delete the session of an account (rejected by the site)
+
+        Args:
+            account (str): account email
+        """
+
+        with self.lock():
+            sessions = self.__read__()
+            if sessions.pop(account, None):
+                self.__write__(sessions)
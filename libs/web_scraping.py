@@ -1,12 +1,21 @@
 import os
+import json
 import time
+import base64
+import random
 import zipfile
+from datetime import datetime
+from collections import deque
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import TimeoutException
+
+from libs.decorators import track_time
+from libs.driver_profiler import DriverProfiler
 
 current_file = os.path.basename(__file__)
 
@@ -14,9 +23,16 @@ current_file = os.path.basename(__file__)
 class WebScraping ():
     """ Class to manage and configure web browser
     """
-    
-    service = None
-    options = None
+
+    # Url patterns blocked with 'block_resources': images, fonts, media
+    # and trackers (stylesheets are kept, the visibility waits need them)
+    blocked_urls = [
+        "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*",
+        "*.bmp*", "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+        "*.mp4*", "*.webm*", "*.mp3*",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*hotjar.com*", "*clarity.ms*", "*nr-data.net*",
+    ]
 
     def __init__(self, headless: bool = False, time_out: int = 0,
                  proxy_server: str = "", proxy_port: str = "",
@@ -26,7 +42,11 @@ class WebScraping ():
                  incognito: bool = False, experimentals: bool = True,
                  start_killing: bool = False, start_openning: bool = True,
                  width: int = 1280, height: int = 720,
-                 mute: bool = True, auto_chrome_folder_windows: bool = False):
+                 mute: bool = True, auto_chrome_folder_windows: bool = False,
+                 network_logs: bool = False, diagnostics_size: int = 20,
+                 screenshots_rate: float = 0, diagnostics_folder: str = "diagnostics",
+                 profile_commands: bool = False, block_resources: bool = False,
+                 page_load_strategy: str = "normal", navigation_budget: float = 30):
         
         """ Save settings and create a new instance of the web browser
 
@@ -48,9 +68,30 @@ class WebScraping ():
             width (int, optional): Width of the window. Defaults to 1280.
             height (int, optional): Height of the window. Defaults to 720.
             mute (bool, optional): Mute the audio of the window. Defaults to True.
+            network_logs (bool, optional): Save network events, to read the
+                responses with 'get_network_responses'. Defaults to False.
+            diagnostics_size (int, optional): Number of recent snapshots kept
+                in memory, saved when a step fails. Defaults to 20.
+            screenshots_rate (float, optional): Fraction of snapshots (0 to 1)
+                with screenshot. Defaults to 0.
+            diagnostics_folder (str, optional): Folder to save the diagnostics
+                of the failed steps. Defaults to "diagnostics".
+            profile_commands (bool, optional): Count and time each webdriver
+                command, in 'profiler'. Defaults to False.
+            block_resources (bool, optional): Skip the download of images,
+                fonts, media and trackers ('blocked_urls'). Defaults to False.
+            page_load_strategy (str, optional): When the navigations end:
+                "normal" (all resources loaded), "eager" (html parsed) or
+                "none" (immediately). Defaults to "normal".
+            navigation_budget (float, optional): Max seconds of each navigation
+                with a readiness condition (see 'set_page'). Defaults to 30.
         """
 
+        if page_load_strategy not in ("normal", "eager", "none"):
+            raise ValueError(f"Invalid page load strategy: {page_load_strategy}")
+
         self.basetime = 1
+        self.wait_poll_time = 0.1
 
         # variables of class
         self.current_folder = os.path.dirname(__file__)
@@ -70,6 +111,18 @@ class WebScraping ():
         self.__width__ = width
         self.__height__ = height
         self.__mute__ = mute
+        self.__network_logs__ = network_logs
+        self.__block_resources__ = block_resources
+        self.__page_load_strategy__ = page_load_strategy
+        self.navigation_budget = navigation_budget
+
+        # Diagnostics (recent snapshots, saved only on errors)
+        self.diagnostics = deque(maxlen=diagnostics_size)
+        self.screenshots_rate = screenshots_rate
+        self.diagnostics_folder = diagnostics_folder
+
+        # Webdriver commands profile (optional)
+        self.profiler = DriverProfiler() if profile_commands else None
         
         self.__web_page__ = None
         
@@ -90,16 +143,28 @@ class WebScraping ():
         # Get current file name
         self.current_file = os.path.basename(__file__)
 
-        # Set time out
+        # Set time out (selenium default: 300s)
+        self.page_load_timeout = 300
         if time_out > 0:
+            self.page_load_timeout = time_out
             self.driver.set_page_load_timeout(time_out)
 
-    def __kill_chrome_terminal__(self):
+    def __kill_chrome_terminal__(self, driver_pid: int = None):
         """ Kill chrome from terminal
+
+        Args:
+            driver_pid (int): process id of the chrome driver. If given, only
+                the driver and its chrome processes are killed. Else, all
+                chrome processes are killed
         """
         
-        windows = 'taskkill /IM "chrome.exe" /F > nul 2>&1'
-        linux = "pkill -9 -f chrome > /dev/null 2>&1"
+        if driver_pid:
+            windows = f'taskkill /PID {driver_pid} /T /F > nul 2>&1'
+            linux = f"pkill -9 -P {driver_pid} > /dev/null 2>&1; "
+            linux += f"kill -9 {driver_pid} > /dev/null 2>&1"
+        else:
+            windows = 'taskkill /IM "chrome.exe" /F > nul 2>&1'
+            linux = "pkill -9 -f chrome > /dev/null 2>&1"
         
         if os.name == "nt":
             os.system(windows)
@@ -130,6 +195,7 @@ class WebScraping ():
             except Exception:
                 pass
 
+    @track_time("browser_start")
     def __set_browser_instance__(self):
         """ Open and configure browser
         """
@@ -138,95 +204,105 @@ class WebScraping ():
         os.environ['WDM_LOG_LEVEL'] = '0'
         os.environ['WDM_PRINT_FIRST_LINE'] = 'False'
 
-        # Configure browser
-        if not WebScraping.options:
-            WebScraping.options = webdriver.ChromeOptions()
-            options_elems = [
-                '--no-sandbox',
-                '--start-maximized',
-                '--output=/dev/null',
-                '--log-level=3',
-                '--disable-notifications',
-                '--disable-infobars',
-                '--safebrowsing-disable-download-protection',
-                '--disable-dev-shm-usage',
-                '--disable-renderer-backgrounding',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-client-side-phishing-detection',
-                '--disable-crash-reporter',
-                '--disable-oopr-debug-crash-dump',
-                '--no-crash-upload',
-                '--disable-gpu',
-                '--disable-extensions',
-                '--disable-low-res-tiling',
-                '--log-level=3',
-                '--silent'
-            ]
+        # Configure browser (own options for each instance)
+        self.options = webdriver.ChromeOptions()
+        self.options.page_load_strategy = self.__page_load_strategy__
+        options_elems = [
+            '--no-sandbox',
+            '--start-maximized',
+            '--output=/dev/null',
+            '--log-level=3',
+            '--disable-notifications',
+            '--disable-infobars',
+            '--safebrowsing-disable-download-protection',
+            '--disable-dev-shm-usage',
+            '--disable-renderer-backgrounding',
+            '--disable-background-timer-throttling',
+            '--disable-backgrounding-occluded-windows',
+            '--disable-client-side-phishing-detection',
+            '--disable-crash-reporter',
+            '--disable-oopr-debug-crash-dump',
+            '--no-crash-upload',
+            '--disable-gpu',
+            '--disable-extensions',
+            '--disable-low-res-tiling',
+            '--log-level=3',
+            '--silent'
+        ]
+        
+        for option in options_elems:
+            self.options.add_argument(option)
+        
+        # Experimentals
+        if self.__experimentals__:
+            self.options.add_experimental_option(
+                'excludeSwitches', ['enable-logging', "enable-automation"])
+            self.options.add_experimental_option(
+                'useAutomationExtension',
+                False
+            )
+
+        # screen size
+        size_option = f"--window-size={self.__width__},{self.__height__}"
+        self.options.add_argument(size_option)
+        
+        # headless mode
+        if self.__headless__:
+            self.options.add_argument("--headless=new")
             
-            for option in options_elems:
-                WebScraping.options.add_argument(option)
+        if self.__mute__:
+            self.options.add_argument("--mute-audio")
             
-            # Experimentals
-            if self.__experimentals__:
-                WebScraping.options.add_experimental_option(
-                    'excludeSwitches', ['enable-logging', "enable-automation"])
-                WebScraping.options.add_experimental_option(
-                    'useAutomationExtension',
-                    False
-                )
+        # Set chrome folder
+        if self.__chrome_folder__:
+            chrome_folder_option = f"--user-data-dir={self.__chrome_folder__}"
+            self.options.add_argument(chrome_folder_option)
+
+        # Set default user agent
+        if self.__user_agent__:
+            self.options.add_argument(f'--user-agent={self.__user_agent__}')
+
+        prefs = {}
+        if self.__download_folder__:
+            prefs.update({
+                'download.default_directory': f'{self.__download_folder__}',
+                'download.prompt_for_download': 'false',
+                'profile.default_content_setting_values.automatic_downloads': 1,
+                'profile.default_content_settings.popups': 0,
+                'download.directory_upgrade': True,
+                'plugins.always_open_pdf_externally': True,
+                'plugins.plugins_list': [
+                    {
+                        'enabled': False,
+                        'name': 'Chrome PDF Viewer'
+                    }
+                ],
+                'download.extensions_to_open': 'xml',
+                'safebrowsing.enabled': True
+            })
 
-            # screen size
-            size_option = f"--window-size={self.__width__},{self.__height__}"
-            WebScraping.options.add_argument(size_option)
-            
-            # headless mode
-            if self.__headless__:
-                WebScraping.options.add_argument("--headless=new")
-                
-            if self.__mute__:
-                WebScraping.options.add_argument("--mute-audio")
-                
-            # Set chrome folder
-            if self.__chrome_folder__:
-                chrome_folder_option = f"--user-data-dir={self.__chrome_folder__}"
-                WebScraping.options.add_argument(chrome_folder_option)
-
-            # Set default user agent
-            if self.__user_agent__:
-                WebScraping.options.add_argument(f'--user-agent={self.__user_agent__}')
-
-            if self.__download_folder__:
-                prefs = {
-                    'download.default_directory': f'{self.__download_folder__}',
-                    'download.prompt_for_download': 'false',
-                    'profile.default_content_setting_values.automatic_downloads': 1,
-                    'profile.default_content_settings.popups': 0,
-                    'download.directory_upgrade': True,
-                    'plugins.always_open_pdf_externally': True,
-                    'plugins.plugins_list': [
-                        {
-                            'enabled': False,
-                            'name': 'Chrome PDF Viewer'
-                        }
-                    ],
-                    'download.extensions_to_open': 'xml',
-                    'safebrowsing.enabled': True
-                }
+        # Don't load images (the blocked urls cover the rest of resources)
+        if self.__block_resources__:
+            prefs['profile.managed_default_content_settings.images'] = 2
 
-                WebScraping.options.add_experimental_option('prefs', prefs)
+        if prefs:
+            self.options.add_experimental_option('prefs', prefs)
 
-            if self.__extensions__:
-                for extension in self.__extensions__:
-                    WebScraping.options.add_extension(extension)
+        if self.__extensions__:
+            for extension in self.__extensions__:
+                self.options.add_extension(extension)
 
-            if self.__incognito__:
-                WebScraping.options.add_argument("--incognito")
+        if self.__incognito__:
+            self.options.add_argument("--incognito")
 
-            if self.__experimentals__:
-                WebScraping.options.add_argument(
-                    "--disable-blink-features=AutomationControlled"
-                )
+        if self.__experimentals__:
+            self.options.add_argument(
+                "--disable-blink-features=AutomationControlled"
+            )
+
+        # Save network events in the performance log
+        if self.__network_logs__:
+            self.options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         
         # Setup proxy
         if self.__proxy_server__ and self.__proxy_port__:
@@ -234,23 +310,32 @@ class WebScraping ():
             # Setup user and password proxy
             if self.__proxy_user__ and self.__proxy_pass__:
                 self.__create_proxy_extension__()
-                WebScraping.options.add_extension(self.__pluginfile__)
+                self.options.add_extension(self.__pluginfile__)
                 
             # Setup basic proxy
             else:
                 proxy = f"{self.__proxy_server__}:{self.__proxy_port__}"
-                WebScraping.options.add_argument(f"--proxy-server={proxy}")
+                self.options.add_argument(f"--proxy-server={proxy}")
+
+        # Autoinstall driver with selenium (own driver process for each instance)
+        self.service = Service()
 
-        # Autoinstall driver with selenium
-        if not WebScraping.service:
-            WebScraping.service = Service()
-          
         # Auto download driver
         self.driver = webdriver.Chrome(
-            service=WebScraping.service,
-            options=WebScraping.options
+            service=self.service,
+            options=self.options
         )
 
+        # Block resources in the network layer
+        if self.__block_resources__:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": self.blocked_urls}
+            )
+
+        if self.profiler:
+            self.profiler.attach(self.driver)
+
     def __create_proxy_extesion__(self):
         """ Create a proxy chrome extension """
 
@@ -327,6 +412,81 @@ class WebScraping ():
 
         self.driver.save_screenshot(file_name)
 
+    def add_snapshot(self, name: str) -> dict:
+        """ Save a lightweight snapshot of the browser in the diagnostics
+        ring buffer (with a screenshot, in 'screenshots_rate' of them)
+
+        Args:
+            name (str): name of the current step (like a method name)
+
+        Returns:
+            dict: snapshot data, to update with the step duration
+        """
+
+        snapshot = {
+            "name": name,
+            "time": datetime.now().isoformat(),
+            "url": "",
+            "duration": None,
+            "error": "",
+            "screenshot": None,
+        }
+
+        try:
+            snapshot["url"] = self.driver.current_url
+            if self.screenshots_rate and random.random() < self.screenshots_rate:
+                snapshot["screenshot"] = self.driver.get_screenshot_as_png()
+        except Exception:
+            pass
+
+        self.diagnostics.append(snapshot)
+        return snapshot
+
+    def save_diagnostics(self, name: str, error: Exception) -> str:
+        """ Save the recent snapshots and a screenshot of the current page
+        in a new folder (with unique name, for concurrent browsers)
+
+        Args:
+            name (str): name of the failed step
+            error (Exception): error of the step
+
+        Returns:
+            str: path of the diagnostics folder
+        """
+
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        folder = os.path.join(
+            self.diagnostics_folder,
+            f"{timestamp}_{os.getpid()}_{id(self)}_{name.strip('_')}"
+        )
+        os.makedirs(folder, exist_ok=True)
+
+        # Save snapshots screenshots and data
+        snapshots = []
+        for index, snapshot in enumerate(self.diagnostics):
+            snapshot_data = dict(snapshot)
+            if snapshot["screenshot"]:
+                file_name = f"{index:03d}_{snapshot['name'].strip('_')}.png"
+                with open(os.path.join(folder, file_name), "wb") as file:
+                    file.write(snapshot["screenshot"])
+                snapshot_data["screenshot"] = file_name
+            snapshots.append(snapshot_data)
+
+        with open(os.path.join(folder, "snapshots.json"), "w") as file:
+            json.dump({
+                "step": name,
+                "error": repr(error),
+                "snapshots": snapshots
+            }, file, indent=4)
+
+        # Screenshot of the page when the error happened
+        try:
+            self.screenshot(os.path.join(folder, "error.png"))
+        except Exception:
+            pass
+
+        return folder
+
     def full_screenshot(self, path: str):
         """ Take a full screenshot of the current browser window
 
@@ -398,53 +558,156 @@ class WebScraping ():
             refresh_back_tab (int): tab to return after refresh
         """
 
-        total_time = 0
+        def is_loaded():
+            try:
+                elem = self.driver.find_element(By.CSS_SELECTOR, selector)
+                elem.text
+                return True
+            except Exception:
+
+                # Refresh page (if required) before the next check
+                if refresh_back_tab != -1:
+                    self.refresh_selenium(back_tab=refresh_back_tab)
+
+                return False
+
+        self.wait_until(is_loaded, time_out, f"the element {selector} to load")
+
+    def wait_until(self, condition, time_out: float = 10, error: str = ""):
+        """ Wait until a condition holds, checking it every 'wait_poll_time'
+
+        Args:
+            condition (callable): function without arguments, that returns
+                a truthy value when the condition holds
+            time_out (float): max seconds to wait
+            error (str): description of the condition, used in the time out error
+
+        Returns:
+            any: last value returned by the condition
+
+        Raises:
+            TimeoutError: if the condition does not hold after 'time_out' seconds
+        """
 
+        end_time = time.monotonic() + time_out
         while True:
-            if total_time < time_out:
-                total_time += 1
-                try:
-                    elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    elem.text
-                    break
-                except Exception:
-
-                    # Wait time or refresh page
-                    if refresh_back_tab != -1:
-                        self.refresh_selenium(back_tab=refresh_back_tab)
-                    else:
-                        time.sleep(self.basetime)
+            try:
+                result = condition()
+            except Exception:
+                result = None
 
-                    continue
-            else:
-                error = f"Time out exeded. The element {selector} is not in the page"
-                raise Exception(error)
+            if result:
+                return result
+
+            if time.monotonic() >= end_time:
+                if not error:
+                    error = "condition"
+                raise TimeoutError(f"Time out exeded ({time_out}s) waiting for {error}")
+
+            time.sleep(self.wait_poll_time)
+
+    def is_visible(self, selector: str) -> bool:
+        """ Check (with js) if any element of the selector is visible in the page
+
+        Args:
+            selector (str): CSS selector of the elements
+
+        Returns:
+            bool: True if at least one element is visible
+        """
+
+        script = """
+        return Array.from(document.querySelectorAll(arguments[0])).some(
+            elem => elem.getClientRects().length > 0
+        )
+        """
+        return self.driver.execute_script(script, selector)
 
     def wait_die(self, selector: str, time_out: int = 10):
-        """ Wait to page vanish and element
-        
+        """ Wait to page vanish (remove or hide) and element
+
         Args:
             selector (str): CSS selector of the element
             time_out (int): time to wait
         """
 
-        self.refresh_selenium()
+        self.wait_until(
+            lambda: not self.is_visible(selector),
+            time_out,
+            f"the element {selector} to vanish"
+        )
 
-        total_time = 0
+    def wait_clickable(self, selector: str, time_out: int = 10) -> WebElement:
+        """ Wait until an element is visible and enabled
 
-        while True:
-            if total_time < time_out:
-                total_time += 1
-                elem = self.get_elems(selector)
-                if not elem:
-                    break
-                self.refresh_selenium()
-                continue
-            else:
-                error = f"Time out exeded. The element {selector} is until in the page"
-                raise Exception(error)
-            
-        self.refresh_selenium()
+        Args:
+            selector (str): CSS selector of the element
+            time_out (int): time to wait
+
+        Returns:
+            WebElement: element in the page
+        """
+
+        def is_clickable():
+            elem = self.driver.find_element(By.CSS_SELECTOR, selector)
+            if elem.is_displayed() and elem.is_enabled():
+                return elem
+            return None
+
+        return self.wait_until(
+            is_clickable,
+            time_out,
+            f"the element {selector} to be clickable"
+        )
+
+    def wait_text_change(self, selector: str, old_text: str, time_out: int = 30) -> str:
+        """ Wait until the text of an element is different from 'old_text'
+
+        Args:
+            selector (str): CSS selector of the element
+            old_text (str): current text of the element
+            time_out (int): time to wait
+
+        Returns:
+            str: new text of the element
+        """
+
+        def get_new_text():
+            text = self.get_text(selector)
+            if text and text != old_text:
+                return text
+            return None
+
+        return self.wait_until(
+            get_new_text,
+            time_out,
+            f"the text of {selector} to change from '{old_text}'"
+        )
+
+    def wait_angular_idle(self, time_out: int = 30):
+        """ Wait until angular has no pending http requests
+        (pages without angular are always idle)
+
+        Args:
+            time_out (int): time to wait
+        """
+
+        script = """
+        if (!window.angular) {
+            return true
+        }
+        const injector = angular.element(document.body).injector()
+        if (!injector) {
+            return true
+        }
+        return injector.get('$http').pendingRequests.length === 0
+        """
+
+        self.wait_until(
+            lambda: self.driver.execute_script(script),
+            time_out,
+            "angular http requests to finish"
+        )
 
     def get_text(self, selector: str) -> str:
         """ Return text for specific element in the page
@@ -485,6 +748,84 @@ class WebScraping ():
 
         return texts
 
+    def get_texts_bulk(self, rows_selector: str, fields: dict,
+                       page_fields: dict = None) -> dict:
+        """ Return the text of several fields inside each row, and of some
+        page level elements, with a single js call
+
+        Args:
+            rows_selector (str): CSS selector of the rows
+            fields (dict): field name -> CSS selector, relative to each row
+            page_fields (dict): field name -> CSS selector, relative to the page
+
+        Returns:
+            dict: data of the page
+                rows (list[dict]): texts of the fields for each row
+                page (dict): texts of the page fields
+        """
+
+        script = """
+        const [rowsSelector, fields, pageFields] = arguments
+
+        function getText(parent, selector) {
+            const elem = parent.querySelector(selector)
+            return elem ? elem.innerText.trim() : ""
+        }
+
+        const rows = Array.from(document.querySelectorAll(rowsSelector)).map(row => {
+            const rowData = {}
+            for (const [name, selector] of Object.entries(fields)) {
+                rowData[name] = getText(row, `:scope ${selector}`)
+            }
+            return rowData
+        })
+
+        const page = {}
+        for (const [name, selector] of Object.entries(pageFields)) {
+            page[name] = getText(document, selector)
+        }
+
+        return {rows, page}
+        """
+
+        return self.driver.execute_script(
+            script, rows_selector, fields, page_fields or {})
+
+    def get_network_responses(self, url_part: str) -> list[str]:
+        """ Return the bodies of the responses received (since the last call),
+        from urls that contain a text. Requires 'network_logs' option
+
+        Args:
+            url_part (str): text in the url of the requests
+
+        Returns:
+            list[str]: bodies of the responses, from oldest to newest
+        """
+
+        bodies = []
+        for log in self.driver.get_log("performance"):
+            message = json.loads(log["message"])["message"]
+            if message["method"] != "Network.responseReceived":
+                continue
+            if url_part not in message["params"]["response"]["url"]:
+                continue
+
+            # Read body from chrome (it can be already discarded)
+            try:
+                response = self.driver.execute_cdp_cmd(
+                    "Network.getResponseBody",
+                    {"requestId": message["params"]["requestId"]}
+                )
+            except Exception:
+                continue
+
+            body = response["body"]
+            if response.get("base64Encoded"):
+                body = base64.b64decode(body).decode("utf-8")
+            bodies.append(body)
+
+        return bodies
+
     def set_attrib(self, selector: str, attrib_name: str, attrib_value: str):
         """ Set a value in specific attribute of an element in the page
 
@@ -597,21 +938,37 @@ class WebScraping ():
 
         self.driver.execute_script(script)
 
-    def set_page(self, web_page: str, time_out: int = 0, break_time_out: bool = False):
+    def set_page(self, web_page: str, time_out: int = 0, break_time_out: bool = False,
+                 ready=None, budget: float = None):
         """ Update the web page in browser
         
         Args:
             web_page (str): url of the page
             time_out (int): time to wait
             break_time_out (bool): break if time out
+            ready (str or callable): readiness condition of the page: CSS
+                selector of an element that must be visible, or function
+                that returns a truthy value when the page is ready
+            budget (float): max seconds of the navigation (page load and
+                readiness condition), with 'ready' or 'budget'.
+                Defaults to 'navigation_budget'
+
+        Raises:
+            TimeoutError: if the page does not load or it is not ready
+                after 'budget' seconds
         """
 
+        if ready or budget:
+            self.__set_page_budget__(web_page, ready, budget or self.navigation_budget)
+            return
+
         try:
 
             self.__web_page__ = web_page
 
             # Save time out when is greader than 0
             if time_out > 0:
+                self.page_load_timeout = time_out
                 self.driver.set_page_load_timeout(time_out)
 
             self.driver.get(self.__web_page__)
@@ -627,6 +984,39 @@ class WebScraping ():
             else:
                 self.driver.execute_script("window.stop();")
 
+    def __set_page_budget__(self, web_page: str, ready, budget: float):
+        """ Load a page and wait for its readiness condition (instead of all
+        the resources), in max 'budget' seconds (see 'set_page')
+
+        Raises:
+            TimeoutError: if the page does not load or it is not ready in time
+        """
+
+        end_time = time.monotonic() + budget
+        self.__web_page__ = web_page
+
+        # Page load with the time out of the budget
+        self.driver.set_page_load_timeout(budget)
+        try:
+            self.driver.get(self.__web_page__)
+        except TimeoutException:
+            raise TimeoutError(
+                f"Time out exeded ({budget}s) loading the page {web_page}"
+            )
+        finally:
+            self.driver.set_page_load_timeout(self.page_load_timeout)
+
+        if not ready:
+            return
+        if not callable(ready):
+            selector = ready
+            ready = lambda: self.is_visible(selector)
+        self.wait_until(
+            ready,
+            round(max(end_time - time.monotonic(), 0), 1),
+            f"the page {web_page} to be ready"
+        )
+
     def click_js(self, selector: str):
         """ Send click with js, for hiden elements
         
@@ -637,6 +1027,30 @@ class WebScraping ():
         elem = self.driver.find_element(By.CSS_SELECTOR, selector)
         self.driver.execute_script("arguments[0].click();", elem)
 
+    def click_by_text_js(self, selector: str, text: str) -> bool:
+        """ Send click with js to the first element with a specific text
+
+        Args:
+            selector (str): CSS selector of the elements
+            text (str): text of the element (case insensitive)
+
+        Returns:
+            bool: True if the element was found and clicked
+        """
+
+        script = """
+        const [selector, text] = arguments
+        const elem = Array.from(document.querySelectorAll(selector)).find(
+            elem => elem.innerText.trim().toUpperCase() === text.trim().toUpperCase()
+        )
+        if (!elem) {
+            return false
+        }
+        elem.click()
+        return true
+        """
+        return self.driver.execute_script(script, selector, text)
+
     def select_drop_down_index(self, selector: str, index: int):
         """ Select specific elemet (with number) in a drop down elemet
         
@@ -784,19 +1198,27 @@ class WebScraping ():
         self.driver.execute_script(script)
 
     def kill(self, kill_terminal: bool = True):
-        """ Detect and close all tabs and optionally kill chrome from terminal
+        """ Close the browser and optionally kill its processes from terminal,
+        if it does not close (other chrome instances are not affected)
         
         Args:
             kill_terminal (bool): if True kill chrome from terminal too
         """
-                
-        tabs = self.driver.window_handles
-        for _ in tabs:
-            self.switch_to_tab(0)
+
+        # Save driver process before closing it
+        driver_pid = None
+        service = getattr(self, "service", None)
+        if service and service.process:
+            driver_pid = service.process.pid
+
+        try:
             self.end_browser()
-            
-        if kill_terminal:
-            self.__kill_chrome_terminal__()
+        except Exception:
+
+            # Browser not responding: kill its processes from terminal
+            # (skipped if the driver already ended: its pid can be reused)
+            if kill_terminal and driver_pid and service.process.poll() is None:
+                self.__kill_chrome_terminal__(driver_pid)
 
     def scroll(self, selector: str, scroll_x: int, scroll_y: int):
         """ Scroll X or Y in specific element of the page
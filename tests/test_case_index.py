@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from libs.case_index import CaseIndex
+from libs.data_manager import DataManager
+from libs.date_ranges import DATE_FORMAT
+from libs.output_sinks import OutputSink
+
+CASE_TYPES = ["TAX DELINQUENCY"]
+
+
+class RowsSink(OutputSink):
+    """ Sink with fixed rows (like a sheet with header) """
+
+    header_rows = 1
+
+    def __init__(self, rows: list[list]):
+        self.rows = rows
+
+    def get_columns_values(self, columns: list[int]) -> list[list]:
+        return [[row[column - 1] for row in self.rows] for column in columns]
+
+
+class WatermarksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_folder = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.temp_folder.name, "index.db")
+        self.case_index = CaseIndex(self.index_path)
+
+    def tearDown(self):
+        self.case_index.close()
+        self.temp_folder.cleanup()
+
+    def get_watermark(self) -> str:
+        return self.case_index.get_watermark(CASE_TYPES[0])
+
+    def test_out_of_order_windows(self):
+        windows = [
+            ("01/01/2024", "01/31/2024"),
+            ("02/01/2024", "02/29/2024"),
+            ("03/01/2024", "03/31/2024"),
+        ]
+        for start_date, end_date in windows:
+            self.case_index.add_window(CASE_TYPES, start_date, end_date)
+
+        # A later window does not move the watermark over a pending one
+        self.case_index.complete_window(CASE_TYPES, *windows[2])
+        self.assertEqual(self.get_watermark(), "")
+
+        self.case_index.complete_window(CASE_TYPES, *windows[0])
+        self.assertEqual(self.get_watermark(), "02/01/2024")
+
+        self.case_index.complete_window(CASE_TYPES, *windows[1])
+        self.assertEqual(self.get_watermark(), "04/01/2024")
+
+    def test_contiguous_windows(self):
+        self.case_index.add_window(CASE_TYPES, "01/01/2024", "01/07/2024", done=True)
+        self.assertEqual(self.get_watermark(), "01/08/2024")
+
+        self.case_index.add_window(CASE_TYPES, "01/08/2024", "01/14/2024")
+        self.assertEqual(self.get_watermark(), "01/08/2024")
+
+        self.case_index.complete_window(CASE_TYPES, "01/08/2024", "01/14/2024")
+        self.assertEqual(self.get_watermark(), "01/15/2024")
+
+    def test_cap_at_today(self):
+        today = datetime.now()
+        start_date = (today - timedelta(days=7)).strftime(DATE_FORMAT)
+        end_date = (today + timedelta(days=7)).strftime(DATE_FORMAT)
+
+        self.case_index.complete_window(CASE_TYPES, start_date, end_date)
+        self.assertEqual(self.get_watermark(), today.strftime(DATE_FORMAT))
+
+    def test_seed_without_watermarks(self):
+        self.case_index.close()
+        sink = RowsSink([
+            ["Description", "Number", "Location", "Type", "Filed Date"],
+            ["Case 1", "1", "Court", CASE_TYPES[0], "03/01/2024"],
+        ])
+        data_manager = DataManager([sink], index_path=self.index_path)
+        self.case_index = data_manager.case_index
+
+        # Only the cases (no header), and the watermark stays empty
+        self.assertEqual(self.case_index.count(), 1)
+        self.assertTrue(self.case_index.contains("1", CASE_TYPES[0]))
+        self.assertEqual(self.get_watermark(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
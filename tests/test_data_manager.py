@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from libs.data_manager import DataManager
+from libs.output_sinks import ArchiveSink
+
+
+def get_cases_data(numbers: range) -> list[dict]:
+    return [
+        {
+            "description": f"Case {number}",
+            "number": str(number),
+            "location": "Court",
+            "type": "TAX DELINQUENCY",
+            "filed_date": "01/02/2024",
+        }
+        for number in numbers
+    ]
+
+
+class WriteOutputDataTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_folder = tempfile.TemporaryDirectory()
+        self.archive_path = os.path.join(self.temp_folder.name, "cases.jsonl.gz")
+        self.index_path = os.path.join(self.temp_folder.name, "index.db")
+
+    def tearDown(self):
+        self.temp_folder.cleanup()
+
+    def test_buffered_rows_not_indexed(self):
+        data_manager = DataManager([ArchiveSink(self.archive_path, 500)],
+                                   index_path=self.index_path)
+        self.assertEqual(data_manager.write_output_data(get_cases_data(range(10))), 10)
+        self.assertFalse(os.path.exists(self.archive_path))
+        self.assertEqual(data_manager.case_index.count(), 0)
+
+        # Crash before the flush: the next run writes the cases again
+        data_manager.case_index.close()
+        data_manager = DataManager([ArchiveSink(self.archive_path, 500)],
+                                   index_path=self.index_path)
+        self.assertEqual(data_manager.write_output_data(get_cases_data(range(10))), 10)
+        data_manager.close()
+
+    def test_indexed_after_flush(self):
+        data_manager = DataManager([ArchiveSink(self.archive_path, 500)],
+                                   index_path=self.index_path)
+        data_manager.write_output_data(get_cases_data(range(10)))
+
+        # Buffered cases are not written twice
+        self.assertEqual(data_manager.write_output_data(get_cases_data(range(5, 15))), 5)
+
+        data_manager.flush()
+        self.assertEqual(data_manager.case_index.count(), 15)
+        self.assertEqual(data_manager.write_output_data(get_cases_data(range(15))), 0)
+        data_manager.close()
+
+    def test_indexed_with_full_buffer(self):
+        data_manager = DataManager([ArchiveSink(self.archive_path, 5)],
+                                   index_path=self.index_path)
+        data_manager.write_output_data(get_cases_data(range(10)))
+        self.assertTrue(os.path.exists(self.archive_path))
+        self.assertEqual(data_manager.case_index.count(), 10)
+        data_manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
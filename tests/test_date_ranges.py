@@ -0,0 +1,43 @@
+import unittest
+
+from libs.date_ranges import split_date_range
+
+
+class SplitDateRangeTest(unittest.TestCase):
+
+    def test_single_window(self):
+        windows = split_date_range("01/01/2024", "03/15/2024")
+        self.assertEqual(windows, [("01/01/2024", "03/15/2024")])
+
+    def test_month_any_case(self):
+        windows = split_date_range("01/15/2024", "03/10/2024", "MONTH")
+        self.assertEqual(windows, [
+            ("01/15/2024", "01/31/2024"),
+            ("02/01/2024", "02/29/2024"),
+            ("03/01/2024", "03/10/2024"),
+        ])
+
+    def test_week(self):
+        windows = split_date_range("01/01/2024", "01/10/2024", "Week")
+        self.assertEqual(windows, [
+            ("01/01/2024", "01/07/2024"),
+            ("01/08/2024", "01/10/2024"),
+        ])
+
+    def test_days(self):
+        windows = split_date_range("01/01/2024", "01/05/2024", "2")
+        self.assertEqual(windows, [
+            ("01/01/2024", "01/02/2024"),
+            ("01/03/2024", "01/04/2024"),
+            ("01/05/2024", "01/05/2024"),
+        ])
+
+    def test_invalid_sizes(self):
+        for size in ["0", "-3", "1.5", "weeks", "day"]:
+            with self.subTest(size=size):
+                with self.assertRaises(ValueError):
+                    split_date_range("01/01/2024", "01/10/2024", size)
+
+
+if __name__ == "__main__":
+    unittest.main()